@@ -0,0 +1,265 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import math
+import threading
+import time
+
+from .Devices.StreamDeck import PreparedKeyImage
+from .Transport.Transport import TransportError
+
+
+class Animator:
+    """
+    Animation engine for a StreamDeck device, displaying looping sequences of
+    frames on any number of its keys. Each frame is shown for its own duration,
+    and all frame updates are scheduled against absolute deadlines from a single
+    thread per deck, so that animations do not drift over time.
+
+    If the host or device cannot keep up with the requested frame rate, frames
+    whose display time has already passed are dropped so that each animation
+    stays on schedule.
+    """
+
+    def __init__(self, deck):
+        """
+        Creates a new animation engine for the given StreamDeck device.
+
+        :param StreamDeck deck: StreamDeck device whose keys are to be animated.
+        """
+        self.deck = deck
+        self.animations = dict()
+        self.animate_thread = None
+        self.run_animate_thread = False
+        self.start_time = None
+        self.shown_frame_count = 0
+        self.dropped_frame_count = 0
+
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+
+    def _next_updates(self, now):
+        """
+        Advances each key animation to the frame that should be shown at the
+        given time, dropping any frames that are already overdue.
+
+        :param float now: Current monotonic clock time, in seconds.
+
+        :rtype: (dict(int, PreparedKeyImage), float)
+        :return: Mapping of keys to their new frame images, and the monotonic
+                 clock time of the next frame deadline (`None` if no keys have
+                 frames left to show).
+        """
+        updates = dict()
+
+        with self.lock:
+            for key, animation in self.animations.items():
+                frames = animation['frames']
+
+                if animation['deadline'] is None:
+                    animation['index'] = 0
+                    animation['deadline'] = now + frames[0][1]
+                    updates[key] = frames[0][0]
+
+                    # A single frame never changes, so is only shown once.
+                    if len(frames) == 1:
+                        animation['deadline'] = math.inf
+
+                    continue
+
+                if animation['deadline'] > now:
+                    continue
+
+                index = (animation['index'] + 1) % len(frames)
+                deadline = animation['deadline']
+
+                # Skip over any whole loops of the animation we have fallen
+                # behind by, before dropping the remaining overdue frames.
+                missed_loops = int((now - deadline) // animation['duration'])
+                if missed_loops:
+                    deadline += missed_loops * animation['duration']
+                    self.dropped_frame_count += missed_loops * len(frames)
+
+                while deadline + frames[index][1] <= now:
+                    deadline += frames[index][1]
+                    index = (index + 1) % len(frames)
+                    self.dropped_frame_count += 1
+
+                animation['index'] = index
+                animation['deadline'] = deadline + frames[index][1]
+                updates[key] = frames[index][0]
+
+            next_deadline = min((a['deadline'] for a in self.animations.values() if a['deadline'] != math.inf), default=None)
+
+        return updates, next_deadline
+
+    def _animate(self):
+        """
+        Animation thread for the deck, showing the next frame of each key
+        animation as it becomes due until the animator is stopped or the deck
+        is closed.
+        """
+        while self.run_animate_thread and self.deck.is_open():
+            self.wake_event.clear()
+
+            updates, next_deadline = self._next_updates(time.monotonic())
+
+            if updates:
+                try:
+                    self.deck.set_key_images(updates)
+                except TransportError:
+                    self.run_animate_thread = False
+                    break
+
+                self.shown_frame_count += len(updates)
+
+            timeout = None
+            if next_deadline is not None:
+                timeout = max(next_deadline - time.monotonic(), 0)
+
+            self.wake_event.wait(timeout)
+
+    def set_key_animation(self, key, frames):
+        """
+        Sets the animation shown on a key of the StreamDeck, replacing any
+        existing animation on that key. The animation loops until it is cleared
+        or the animator is stopped; an animation of a single frame is shown
+        once, and not sent to the deck again.
+
+        .. seealso:: See :func:`~PILHelper.to_native_animation` method for
+                     converting an animated PIL image into a list of frames.
+
+        :param int key: Index of the button to animate.
+        :param list((enumerable, float)) frames: List of frames, each a pair of
+                                                 the frame's image in the native
+                                                 format of the deck (or a
+                                                 prepared key image) and its
+                                                 display duration in seconds.
+        """
+        if not 0 <= key < self.deck.key_count():
+            raise IndexError("Invalid key index {}.".format(key))
+
+        if not frames:
+            raise ValueError("Animations must contain at least one frame.")
+
+        prepared_frames = []
+        for image, duration in frames:
+            if not isinstance(image, PreparedKeyImage):
+                image = self.deck.prepare_key_image(image)
+
+            prepared_frames.append((image, max(float(duration), 0.001)))
+
+        with self.lock:
+            self.animations[key] = {
+                'frames': prepared_frames,
+                'duration': sum(duration for image, duration in prepared_frames),
+                'index': None,
+                'deadline': None,
+            }
+
+        self.wake_event.set()
+
+    def clear_key_animation(self, key):
+        """
+        Stops the animation (if any) shown on a key of the StreamDeck. The key
+        keeps showing its current frame until a new image is set.
+
+        :param int key: Index of the button to stop animating.
+        """
+        with self.lock:
+            self.animations.pop(key, None)
+
+        self.wake_event.set()
+
+    def start(self):
+        """
+        Starts the animation thread, showing the animations of all keys. The
+        deck must already be open.
+
+        .. seealso:: See :func:`~Animator.stop` for the corresponding stop method.
+        """
+        if self.is_running():
+            return
+
+        with self.lock:
+            for animation in self.animations.values():
+                animation['deadline'] = None
+
+        self.start_time = time.monotonic()
+        self.shown_frame_count = 0
+        self.dropped_frame_count = 0
+
+        self.run_animate_thread = True
+        self.animate_thread = threading.Thread(target=self._animate)
+        self.animate_thread.daemon = True
+        self.animate_thread.start()
+
+    def stop(self):
+        """
+        Stops the animation thread, leaving each key showing its current frame.
+
+        .. seealso:: See :func:`~Animator.start` for the corresponding start method.
+        """
+        if self.animate_thread is None:
+            return
+
+        self.run_animate_thread = False
+        self.wake_event.set()
+
+        try:
+            self.animate_thread.join()
+        except RuntimeError:
+            pass
+
+        self.animate_thread = None
+
+    def is_running(self):
+        """
+        Indicates if the animation thread is currently running.
+
+        :rtype: bool
+        :return: `True` if the animator is running, `False` otherwise.
+        """
+        return self.animate_thread is not None and self.animate_thread.is_alive()
+
+    def target_fps(self):
+        """
+        Retrieves the total number of key frames per second requested by the
+        current animations, summed across all animated keys (excluding those
+        showing a single, static frame).
+
+        :rtype: float
+        :return: Requested frame rate, in frames per second.
+        """
+        with self.lock:
+            return sum(len(a['frames']) / a['duration'] for a in self.animations.values() if len(a['frames']) > 1)
+
+    def achieved_fps(self):
+        """
+        Retrieves the total number of key frames per second actually shown on
+        the deck since the animator was started, summed across all animated
+        keys.
+
+        :rtype: float
+        :return: Achieved frame rate, in frames per second.
+        """
+        if self.start_time is None:
+            return 0.0
+
+        elapsed = time.monotonic() - self.start_time
+        return self.shown_frame_count / elapsed if elapsed > 0 else 0.0
+
+    def dropped_frames(self):
+        """
+        Retrieves the number of frames that were skipped since the animator was
+        started, because their display time had passed before they could be
+        shown.
+
+        :rtype: int
+        :return: Number of dropped frames.
+        """
+        return self.dropped_frame_count
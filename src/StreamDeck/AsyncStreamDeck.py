@@ -0,0 +1,239 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+
+
+class AsyncStreamDeck:
+    """
+    Wrapper around a :class:`StreamDeck` instance for use from Python 3
+    `asyncio` applications. Operations that communicate with the device are
+    exposed as coroutines, which run on a dedicated worker thread for the deck
+    so that they never block the event loop. Operations run in the order they
+    were awaited.
+
+    Any other attributes of the wrapped deck (for example, :func:`~StreamDeck.key_count`
+    or :func:`~StreamDeck.key_image_format`) are forwarded to it unchanged.
+    """
+
+    def __init__(self, deck, max_pending_events=64):
+        """
+        Creates a new asynchronous wrapper around the given StreamDeck.
+
+        :param StreamDeck deck: StreamDeck device to wrap.
+        :param int max_pending_events: Maximum number of key events that are
+                                       buffered for :func:`~AsyncStreamDeck.events`
+                                       before older events of the same key
+                                       are discarded.
+        """
+        self.deck = deck
+        self.max_pending_events = max_pending_events
+        self.dropped_event_count = 0
+        self.executor = None
+
+    def __getattr__(self, name):
+        """
+        Attribute handler, forwarding attributes not defined by the wrapper to
+        the wrapped StreamDeck.
+        """
+        return getattr(self.deck, name)
+
+    async def _run(self, function, *args):
+        """
+        Runs a blocking function on the deck's worker thread.
+
+        :param function function: Function to run.
+
+        :return: Return value of the function.
+        """
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args))
+
+    async def open(self):
+        """
+        Opens the device for input/output.
+
+        .. seealso:: See :func:`~StreamDeck.open` for more information.
+        """
+        await self._run(self.deck.open)
+
+    async def close(self):
+        """
+        Closes the device for input/output, and shuts down the deck's worker
+        thread. A new worker thread is started if the deck is re-opened.
+
+        .. seealso:: See :func:`~StreamDeck.close` for more information.
+        """
+        await self._run(self.deck.close)
+
+        executor, self.executor = self.executor, None
+        executor.shutdown(wait=False)
+
+    async def reset(self):
+        """
+        Resets the StreamDeck, clearing all button images and showing the
+        standby image.
+
+        .. seealso:: See :func:`~StreamDeck.reset` for more information.
+        """
+        await self._run(self.deck.reset)
+
+    async def set_brightness(self, percent):
+        """
+        Sets the global screen brightness of the StreamDeck.
+
+        .. seealso:: See :func:`~StreamDeck.set_brightness` for more information.
+
+        :param int/float percent: brightness percent, from [0-100] as an `int`,
+                                  or normalized to [0.0-1.0] as a `float`.
+        """
+        await self._run(self.deck.set_brightness, percent)
+
+    async def get_serial_number(self):
+        """
+        Gets the serial number of the attached StreamDeck.
+
+        :rtype: str
+        :return: String containing the serial number of the attached device.
+        """
+        return await self._run(self.deck.get_serial_number)
+
+    async def get_firmware_version(self):
+        """
+        Gets the firmware version of the attached StreamDeck.
+
+        :rtype: str
+        :return: String containing the firmware version of the attached device.
+        """
+        return await self._run(self.deck.get_firmware_version)
+
+    async def refresh_info(self):
+        """
+        Reads the serial number and firmware version of the attached StreamDeck
+        from the device again.
+
+        .. seealso:: See :func:`~StreamDeck.refresh_info` for more information.
+        """
+        await self._run(self.deck.refresh_info)
+
+    async def set_key_image(self, key, image):
+        """
+        Sets the image of a button on the StreamDeck to the given image.
+
+        .. seealso:: See :func:`~StreamDeck.set_key_image` for more information.
+
+        :param int key: Index of the button whose image is to be updated.
+        :param enumerable image: Raw data of the image to set on the button.
+                                 If `None`, the key will be cleared to a black
+                                 color.
+        """
+        await self._run(self.deck.set_key_image, key, image)
+
+    async def set_key_images(self, images):
+        """
+        Sets the images of several buttons on the StreamDeck at once.
+
+        .. seealso:: See :func:`~StreamDeck.set_key_images` for more information.
+
+        :param dict(int, enumerable) images: Mapping of button indexes to the
+                                             raw data of the image to set on
+                                             each button.
+        """
+        await self._run(self.deck.set_key_images, images)
+
+    async def clear_keys(self, keys=None):
+        """
+        Clears the images of several buttons on the StreamDeck to a black color.
+
+        .. seealso:: See :func:`~StreamDeck.clear_keys` for more information.
+
+        :param enumerable(int) keys: Indexes of the buttons to clear, `None` to
+                                     clear all buttons.
+        """
+        await self._run(self.deck.clear_keys, keys)
+
+    async def flush(self):
+        """
+        Waits until all key images queued for the deck's background writer
+        thread have been sent to the StreamDeck.
+
+        .. seealso:: See :func:`~StreamDeck.flush` for more information.
+        """
+        await self._run(self.deck.flush)
+
+    def dropped_events(self):
+        """
+        Retrieves the number of key events that were discarded because they
+        were not consumed from :func:`~AsyncStreamDeck.events` fast enough.
+
+        :rtype: int
+        :return: Number of key events discarded.
+        """
+        return self.dropped_event_count
+
+    async def events(self):
+        """
+        Asynchronous iterator over the key state changes of the StreamDeck,
+        for use with `async for`. Each event is a `(key, state)` tuple, where
+        `state` is `True` if the key was pressed and `False` if it was released.
+
+        If events are not consumed fast enough, up to `max_pending_events` are
+        buffered. Past that, a new event replaces any events of the same key
+        still pending, so that the latest state of every key is always
+        delivered (see :func:`~AsyncStreamDeck.dropped_events`). The deck's
+        reader thread never waits for the consumer, so an iterator that is
+        abandoned without being closed cannot stall it.
+
+        .. note:: This replaces the key callback (if any) registered on the
+                  wrapped deck for as long as the iterator is active, and
+                  restores it once the iterator is closed.
+
+        :rtype: AsyncIterator((int, bool))
+        :return: Asynchronous iterator of key state change events.
+        """
+        loop = asyncio.get_running_loop()
+        pending_events = collections.deque()
+        event_ready = asyncio.Event()
+
+        def put_event(key, state):
+            if len(pending_events) >= self.max_pending_events:
+                remaining_events = [event for event in pending_events if event[0] != key]
+
+                self.dropped_event_count += len(pending_events) - len(remaining_events)
+
+                pending_events.clear()
+                pending_events.extend(remaining_events)
+
+            pending_events.append((key, state))
+            event_ready.set()
+
+        def callback(deck, key, state):
+            try:
+                loop.call_soon_threadsafe(put_event, key, state)
+            except RuntimeError:
+                # The event loop has been closed, so there is no consumer left.
+                pass
+
+        previous_callback = self.deck.key_callback
+        self.deck.set_key_callback(callback)
+
+        try:
+            while True:
+                while not pending_events:
+                    event_ready.clear()
+                    await event_ready.wait()
+
+                yield pending_events.popleft()
+        finally:
+            if self.deck.key_callback is callback:
+                self.deck.set_key_callback(previous_callback)
@@ -5,13 +5,7 @@
 #         www.fourwalledcubicle.com
 #
 
-from .Devices.StreamDeckMini import StreamDeckMini
-from .Devices.StreamDeckOriginal import StreamDeckOriginal
-from .Devices.StreamDeckOriginalV2 import StreamDeckOriginalV2
-from .Devices.StreamDeckXL import StreamDeckXL
-from .Devices.StreamDeckPedal import StreamDeckPedal
-from .Transport.Dummy import Dummy
-from .Transport.LibUSBHIDAPI import LibUSBHIDAPI
+import importlib
 
 
 class ProbeError(Exception):
@@ -38,6 +32,58 @@ class DeviceManager:
     USB_PID_STREAMDECK_MK2 = 0x0080
     USB_PID_STREAMDECK_PEDAL = 0x0086
 
+    # Device classes are given by name, and only imported the first time a
+    # device of that model is found.
+    DEVICE_CLASSES = {
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_ORIGINAL): ".Devices.StreamDeckOriginal.StreamDeckOriginal",
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_ORIGINAL_V2): ".Devices.StreamDeckOriginalV2.StreamDeckOriginalV2",
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_MINI): ".Devices.StreamDeckMini.StreamDeckMini",
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_XL): ".Devices.StreamDeckXL.StreamDeckXL",
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_MK2): ".Devices.StreamDeckOriginalV2.StreamDeckOriginalV2",
+        (USB_VID_ELGATO, USB_PID_STREAMDECK_PEDAL): ".Devices.StreamDeckPedal.StreamDeckPedal",
+    }
+
+    TRANSPORT_CLASSES = {
+        "dummy": ".Transport.Dummy.Dummy",
+        "libusb": ".Transport.LibUSBHIDAPI.LibUSBHIDAPI",
+    }
+
+    @staticmethod
+    def _import_class(class_name):
+        """
+        Imports a class given by its full name, relative to the StreamDeck
+        package, e.g. `.Devices.StreamDeckXL.StreamDeckXL`.
+
+        :param str class_name: Name of the class to import.
+
+        :rtype: type
+        :return: Imported class.
+        """
+
+        module_name, _, class_name = class_name.rpartition(".")
+        return getattr(importlib.import_module(module_name, __package__), class_name)
+
+    @classmethod
+    def _get_device_class(cls, vid, pid):
+        """
+        Retrieves the StreamDeck class registered for the given USB Vendor and
+        Product IDs, importing it on first use.
+
+        :param int vid: USB Vendor ID of the device model.
+        :param int pid: USB Product ID of the device model.
+
+        :rtype: type
+        :return: :class:`StreamDeck` subclass for the device model.
+        """
+
+        class_type = cls.DEVICE_CLASSES[(vid, pid)]
+
+        if isinstance(class_type, str):
+            class_type = cls._import_class(class_type)
+            cls.DEVICE_CLASSES[(vid, pid)] = class_type
+
+        return class_type
+
     @staticmethod
     def _get_transport(transport):
         """
@@ -51,10 +97,7 @@ class DeviceManager:
         :return: Instance of a HID Transport class
         """
 
-        transports = {
-            "dummy": Dummy,
-            "libusb": LibUSBHIDAPI,
-        }
+        transports = DeviceManager.TRANSPORT_CLASSES
 
         if transport:
             transport_class = transports.get(transport)
@@ -63,6 +106,7 @@ class DeviceManager:
                 raise ProbeError("Unknown HID transport backend \"{}\".".format(transport))
 
             try:
+                transport_class = DeviceManager._import_class(transport_class)
                 transport_class.probe()
                 return transport_class()
             except Exception as transport_error:
@@ -75,6 +119,7 @@ class DeviceManager:
                     continue
 
                 try:
+                    transport_class = DeviceManager._import_class(transport_class)
                     transport_class.probe()
                     return transport_class()
                 except Exception as transport_error:
@@ -89,6 +134,45 @@ class DeviceManager:
         :param str transport: name of the the specific HID transport back-end to use, None to auto-probe.
         """
         self.transport = self._get_transport(transport)
+        self.hotplug_watcher = None
+
+    @classmethod
+    def register_device_class(cls, vid, pid, class_type):
+        """
+        Registers a StreamDeck device class, used to represent any attached
+        devices with the given USB Vendor and Product IDs. This can be used to
+        add support for new models of StreamDeck, or to replace the class used
+        for an existing model.
+
+        :param int vid: USB Vendor ID of the device model.
+        :param int pid: USB Product ID of the device model.
+        :param type/str class_type: :class:`StreamDeck` subclass to create for
+                                    each detected device of the model, or the
+                                    full name of the class to import when the
+                                    first device of the model is found.
+        """
+        cls.DEVICE_CLASSES[(vid, pid)] = class_type
+
+    def _enumerate_devices(self):
+        """
+        Detect attached devices of any registered StreamDeck model.
+
+        :rtype: list((type, Transport.Device))
+        :return: list of StreamDeck class and transport device pairs, one for
+                 each detected device.
+        """
+
+        vendor_products = dict()
+        for vid, pid in self.DEVICE_CLASSES.keys():
+            vendor_products.setdefault(vid, []).append(pid)
+
+        devices = list()
+
+        for vid, pids in vendor_products.items():
+            for device in self.transport.enumerate_products(vid=vid, pids=pids):
+                devices.append((self._get_device_class(vid, device.product_id()), device))
+
+        return devices
 
     def enumerate(self):
         """
@@ -98,19 +182,49 @@ class DeviceManager:
         :return: list of :class:`StreamDeck` instances, one for each detected device.
         """
 
-        products = [
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_ORIGINAL, StreamDeckOriginal),
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_ORIGINAL_V2, StreamDeckOriginalV2),
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_MINI, StreamDeckMini),
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_XL, StreamDeckXL),
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_MK2, StreamDeckOriginalV2),
-            (self.USB_VID_ELGATO, self.USB_PID_STREAMDECK_PEDAL, StreamDeckPedal),
-        ]
+        return [class_type(device) for class_type, device in self._enumerate_devices()]
+
+    def start_hotplug_watcher(self, source=None):
+        """
+        Starts watching for StreamDeck devices being attached to or removed
+        from the host. While the watcher is running, checking if a StreamDeck
+        is still connected (see :func:`~StreamDeck.connected`) uses the
+        watcher's cached set of attached devices, rather than enumerating all
+        of the host's devices each time.
+
+        Callbacks fired when a device is attached or removed can be registered
+        with :func:`~HotplugWatcher.add_callback` on the returned watcher.
+
+        :param HotplugSource source: Event source to use, `None` to use the
+                                     best available source for the host.
+
+        :rtype: HotplugWatcher
+        :return: Running hotplug watcher for this device manager.
+        """
+
+        from .HotplugWatcher import HotplugWatcher
+
+        if self.hotplug_watcher is None:
+            self.hotplug_watcher = HotplugWatcher(lambda: [device.path() for _, device in self._enumerate_devices()], source)
+            self.hotplug_watcher.start()
+
+            self.transport.set_hotplug_watcher(self.hotplug_watcher)
+
+        return self.hotplug_watcher
+
+    def stop_hotplug_watcher(self):
+        """
+        Stops watching for StreamDeck devices being attached to or removed
+        from the host.
+
+        .. seealso:: See :func:`~DeviceManager.start_hotplug_watcher` for the
+                     corresponding start method.
+        """
 
-        streamdecks = list()
+        if self.hotplug_watcher is None:
+            return
 
-        for vid, pid, class_type in products:
-            found_devices = self.transport.enumerate(vid=vid, pid=pid)
-            streamdecks.extend([class_type(d) for d in found_devices])
+        self.transport.set_hotplug_watcher(None)
 
-        return streamdecks
+        self.hotplug_watcher.stop()
+        self.hotplug_watcher = None
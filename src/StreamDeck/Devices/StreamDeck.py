@@ -5,13 +5,37 @@
 #         www.fourwalledcubicle.com
 #
 
+import hashlib
 import threading
-import time
 from abc import ABC, abstractmethod
 
 from ..Transport.Transport import TransportError
 
 
+class PreparedKeyImage:
+    """
+    Represents a key image that has been pre-split into the padded image report
+    payloads of a specific StreamDeck model, ready to be sent to any key of a
+    device of that model.
+
+    .. seealso:: See :func:`~StreamDeck.prepare_key_image` method to create a
+                 prepared key image.
+    """
+
+    __slots__ = ('deck_class', 'pages', 'digest')
+
+    def __init__(self, deck_class, pages, digest):
+        object.__setattr__(self, 'deck_class', deck_class)
+        object.__setattr__(self, 'pages', pages)
+        object.__setattr__(self, 'digest', digest)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Prepared key images are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Prepared key images are immutable.")
+
+
 class StreamDeck(ABC):
     """
     Represents a physically attached StreamDeck device.
@@ -30,6 +54,12 @@ class StreamDeck(ABC):
     DECK_TYPE = None
     DECK_VISUAL = None
 
+    IMAGE_REPORT_LENGTH = None
+    IMAGE_REPORT_HEADER_LENGTH = None
+    IMAGE_REPORT_PAYLOAD_LENGTH = None
+
+    BLANK_KEY_IMAGE = None
+
     def __init__(self, device):
         self.device = device
         self.last_key_states = [False] * self.KEY_COUNT
@@ -37,19 +67,43 @@ class StreamDeck(ABC):
         self.run_read_thread = False
         self.read_poll_hz = 20
         self.key_callback = None
+        self.shared_reader = None
+
+        self.cached_serial_number = None
+        self.cached_firmware_version = None
 
         self.update_lock = threading.RLock()
 
+        self.image_report_buffer = bytearray()
+        self.image_report_padding = None
+
+        self.blank_key_image = None
+        self.key_image_digests = None
+        self.skipped_key_image_count = 0
+
+        self.write_thread = None
+        self.run_write_thread = False
+        self.write_in_progress = False
+        self.write_error = None
+        self.pending_key_images = dict()
+        self.write_condition = threading.Condition()
+
     def __del__(self):
         """
         Delete handler for the StreamDeck, automatically closing the transport
-        if it is currently open and terminating the transport reader thread.
+        if it is currently open and terminating the transport reader and
+        background writer threads.
         """
         try:
             self._setup_reader(None)
         except (TransportError, ValueError):
             pass
 
+        try:
+            self._setup_writer(False)
+        except (TransportError, ValueError):
+            pass
+
         try:
             self.device.close()
         except (TransportError):
@@ -72,15 +126,38 @@ class StreamDeck(ABC):
         self.update_lock.release()
 
     @abstractmethod
-    def _read_key_states(self):
+    def _read_key_states(self, timeout=None):
         """
         Reads the raw key states from an attached StreamDeck.
 
+        :param int timeout: Maximum time to wait for a key report, in
+                            milliseconds, or `None` to return immediately.
+
         :rtype: list(bool)
         :return: List containing the raw key states.
         """
         pass
 
+    @abstractmethod
+    def _read_serial_number(self):
+        """
+        Reads the serial number of the attached StreamDeck from the device.
+
+        :rtype: str
+        :return: String containing the serial number of the attached device.
+        """
+        pass
+
+    @abstractmethod
+    def _read_firmware_version(self):
+        """
+        Reads the firmware version of the attached StreamDeck from the device.
+
+        :rtype: str
+        :return: String containing the firmware version of the attached device.
+        """
+        pass
+
     @abstractmethod
     def _reset_key_stream(self):
         """
@@ -91,6 +168,195 @@ class StreamDeck(ABC):
         """
         pass
 
+    @abstractmethod
+    def _write_image_report_header(self, report, key, page_number, payload_length, is_last):
+        """
+        Writes the header of a single key image report into the given report
+        buffer, in the format expected by the StreamDeck.
+
+        :param memoryview report: Report buffer to write the header into.
+        :param int key: Index of the button the image report is for.
+        :param int page_number: Index of the image page within the report sequence.
+        :param int payload_length: Number of image bytes in the report.
+        :param bool is_last: `True` if this is the final report of the image.
+        """
+        pass
+
+    def _image_report_payload_length(self, image_length):
+        """
+        Determines the maximum number of image bytes that are sent in each of the
+        key image reports for an image of the given length.
+
+        :param int image_length: Length of the image being sent, in bytes.
+
+        :rtype: int
+        :return: Maximum image payload length of each report.
+        """
+        return self.IMAGE_REPORT_PAYLOAD_LENGTH
+
+    def _key_image_pages(self, image):
+        """
+        Splits raw key image data into the payloads of the individual HID
+        reports needed to send it to the StreamDeck.
+
+        :param memoryview image: Raw image data to split.
+
+        :rtype: list((int, memoryview))
+        :return: List of payload length and payload data pairs, one per report.
+        """
+        image_length = len(image)
+        payload_length = self._image_report_payload_length(image_length)
+
+        pages = []
+        for offset in range(0, image_length, payload_length):
+            payload = image[offset:offset + payload_length]
+            pages.append((len(payload), payload))
+
+        return pages
+
+    def _key_image_reports(self, key_images):
+        """
+        Splits one or more key images into the sequence of HID reports needed to
+        send them to the StreamDeck. Reports are assembled in place within a
+        reusable per-device buffer, so that no intermediate copies of the image
+        data are made.
+
+        .. note:: The returned reports are views into the device's report buffer,
+                  and are only valid until the next call to this method. The
+                  deck's update lock should be held until they have been sent.
+
+        :param list((int, memoryview/PreparedKeyImage)) key_images: List of
+            button index and raw (or prepared) image data pairs to send.
+
+        :rtype: list(memoryview)
+        :return: List of image reports, in the order they should be sent.
+        """
+        report_length = self.IMAGE_REPORT_LENGTH
+        header_length = self.IMAGE_REPORT_HEADER_LENGTH
+
+        pages = []
+        for key, image in key_images:
+            image_pages = image.pages if isinstance(image, PreparedKeyImage) else self._key_image_pages(image)
+            last_page = len(image_pages) - 1
+
+            pages.extend((key, page_number, page, page_number == last_page) for page_number, page in enumerate(image_pages))
+
+        if len(self.image_report_buffer) < len(pages) * report_length:
+            self.image_report_buffer = bytearray(len(pages) * report_length)
+
+        if self.image_report_padding is None:
+            self.image_report_padding = memoryview(bytes(report_length))
+
+        buffer = memoryview(self.image_report_buffer)
+
+        reports = []
+        for index, (key, page_number, (payload_length, payload), is_last) in enumerate(pages):
+            report = buffer[index * report_length:(index + 1) * report_length]
+            payload_end = header_length + len(payload)
+
+            self._write_image_report_header(report, key, page_number, payload_length, is_last)
+            report[header_length:payload_end] = payload
+            report[payload_end:] = self.image_report_padding[payload_end:]
+
+            reports.append(report)
+
+        return reports
+
+    def _write_key_images(self, key_images):
+        """
+        Sends one or more key images to the StreamDeck. If key image
+        de-duplication is enabled, images identical to the one last sent to a
+        button are skipped.
+
+        :param list((int, memoryview/PreparedKeyImage)) key_images: List of
+            button index and raw (or prepared) image data pairs to send.
+        """
+        with self.update_lock:
+            if self.key_image_digests is not None:
+                digests = dict()
+
+                for key, image in key_images:
+                    digest = self._key_image_digest(image)
+
+                    if self.key_image_digests.get(key) == digest:
+                        self.skipped_key_image_count += 1
+                    else:
+                        digests[key] = digest
+
+                key_images = [(key, image) for key, image in key_images if key in digests]
+
+                # Forget the old images first, so that a failed write leaves the
+                # affected keys in an unknown (and therefore not skipped) state.
+                for key in digests:
+                    self.key_image_digests.pop(key, None)
+
+            if not key_images:
+                return
+
+            self.device.write_many(self._key_image_reports(key_images))
+
+            if self.key_image_digests is not None:
+                self.key_image_digests.update(digests)
+
+    def _key_image_digest(self, image):
+        """
+        Computes a digest of the given key image, used to detect when an image
+        is identical to one previously sent to the StreamDeck.
+
+        :param memoryview/PreparedKeyImage image: Raw or prepared image data.
+
+        :rtype: bytes
+        :return: Digest of the image data.
+        """
+        if isinstance(image, PreparedKeyImage):
+            return image.digest
+
+        return hashlib.blake2b(image, digest_size=16).digest()
+
+    def _submit_key_images(self, key_images):
+        """
+        Sends one or more key images to the StreamDeck, either immediately or
+        via the background writer thread if it is enabled. Queued images
+        replace any image still pending for the same key.
+
+        :param list((int, memoryview/PreparedKeyImage)) key_images: List of
+            button index and raw (or prepared) image data pairs to send.
+        """
+        with self.write_condition:
+            if self.run_write_thread:
+                self._raise_write_error()
+
+                self.pending_key_images.update(key_images)
+                self.write_condition.notify_all()
+                return
+
+        self._write_key_images(key_images)
+
+    def _raise_write_error(self):
+        """
+        Raises the error (if any) of the last failed background write, so that
+        it is reported to the application. Must be called with the write
+        condition held.
+        """
+        error = self.write_error
+        if error is not None:
+            self.write_error = None
+            raise error
+
+    def _invalidate_key_images(self):
+        """
+        Discards any cached knowledge of the images currently shown on the
+        StreamDeck's buttons, so that the next image set on each button is
+        always sent to the device.
+
+        .. note:: This does not take the update lock, as it is called from
+                  :func:`~StreamDeck.close` on the reader thread, which may
+                  be joined by another thread holding the lock.
+        """
+        key_image_digests = self.key_image_digests
+        if key_image_digests is not None:
+            key_image_digests.clear()
+
     def _extract_string(self, data):
         """
         Extracts out a human-readable string from a collection of raw bytes,
@@ -99,6 +365,109 @@ class StreamDeck(ABC):
 
         return str(bytes(data), 'ascii', 'replace').partition('\0')[0].rstrip()
 
+    def _create_blank_key_image(self):
+        """
+        Creates the raw image data of a blank (black) key, for models that do
+        not define a fixed `BLANK_KEY_IMAGE`.
+
+        :rtype: bytes
+        :return: Blank key image in the native format of the StreamDeck.
+        """
+        return bytes()
+
+    def _blank_key_image(self):
+        """
+        Retrieves the raw image data of a blank (black) key. This is created on
+        first use, and then shared by all instances of the same model.
+
+        :rtype: bytes
+        :return: Blank key image in the native format of the StreamDeck.
+        """
+        deck_class = type(self)
+
+        if deck_class.BLANK_KEY_IMAGE is None:
+            deck_class.BLANK_KEY_IMAGE = self._create_blank_key_image()
+
+        return deck_class.BLANK_KEY_IMAGE
+
+    def _blank_prepared_key_image(self):
+        """
+        Retrieves the blank (black) key image, pre-split into image report
+        payloads. This is created on first use, so that clearing keys never
+        needs to split or copy the blank image data again.
+
+        :rtype: PreparedKeyImage
+        :return: Prepared blank key image.
+        """
+        if self.blank_key_image is None:
+            self.blank_key_image = self.prepare_key_image(None)
+
+        return self.blank_key_image
+
+    def _image_buffer(self, image):
+        """
+        Retrieves a flat byte view of the given key image data, only copying
+        the data if it is not already held in an object supporting the buffer
+        protocol. The blank key image is substituted if no image was given.
+
+        :param enumerable image: Raw image data, or `None` for a blank image.
+
+        :rtype: memoryview
+        :return: Byte view of the image data.
+        """
+        if image is not None:
+            try:
+                image = memoryview(image).cast('B')
+            except TypeError:
+                image = memoryview(bytes(image))
+
+        if not image:
+            image = memoryview(self._blank_key_image())
+
+        return image
+
+    def _key_image_data(self, key, image):
+        """
+        Validates a button index and retrieves the image data to send to it,
+        substituting the blank key image if no image was given.
+
+        :param int key: Index of the button whose image is to be updated.
+        :param enumerable/PreparedKeyImage image: Raw data of the image to set
+                                                  on the button, a prepared key
+                                                  image, or `None` to clear it
+                                                  to a black color.
+
+        :rtype: memoryview/PreparedKeyImage
+        :return: Image data to send.
+        """
+        if min(max(key, 0), self.KEY_COUNT) != key:
+            raise IndexError("Invalid key index {}.".format(key))
+
+        if image is None:
+            return self._blank_prepared_key_image()
+
+        if isinstance(image, PreparedKeyImage):
+            if image.deck_class is not type(self):
+                raise ValueError("Prepared key image was created for a different StreamDeck model.")
+
+            return image
+
+        return self._image_buffer(image)
+
+    def _update_key_states(self, new_key_states):
+        """
+        Caches a new set of key states read from the StreamDeck, firing off any
+        registered callbacks for keys that have changed state.
+
+        :param list(bool) new_key_states: New key states read from the device.
+        """
+        if self.key_callback is not None:
+            for k, (old, new) in enumerate(zip(self.last_key_states, new_key_states)):
+                if old != new:
+                    self.key_callback(self, k, new)
+
+        self.last_key_states = new_key_states
+
     def _read(self):
         """
         Read handler for the underlying transport, listening for button state
@@ -107,17 +476,14 @@ class StreamDeck(ABC):
         """
         while self.run_read_thread:
             try:
-                new_key_states = self._read_key_states()
+                # Wait for new key states within the transport, so that we wake
+                # up as soon as a report arrives, but still periodically check
+                # if the reader thread should terminate.
+                new_key_states = self._read_key_states(timeout=max(1000 // self.read_poll_hz, 1))
                 if new_key_states is None:
-                    time.sleep(1.0 / self.read_poll_hz)
                     continue
 
-                if self.key_callback is not None:
-                    for k, (old, new) in enumerate(zip(self.last_key_states, new_key_states)):
-                        if old != new:
-                            self.key_callback(self, k, new)
-
-                self.last_key_states = new_key_states
+                self._update_key_states(new_key_states)
             except (TransportError):
                 self.run_read_thread = False
                 self.close()
@@ -145,24 +511,110 @@ class StreamDeck(ABC):
             self.read_thread.daemon = True
             self.read_thread.start()
 
+    def _write(self):
+        """
+        Background writer for the StreamDeck, sending the latest pending image
+        of each key to the device. Images queued for a key while an earlier
+        image is still pending replace it, so stale images are never sent.
+        """
+        while True:
+            with self.write_condition:
+                while self.run_write_thread and not self.pending_key_images:
+                    self.write_condition.wait()
+
+                if not self.pending_key_images:
+                    break
+
+                key_images = list(self.pending_key_images.items())
+                self.pending_key_images.clear()
+                self.write_in_progress = True
+
+            # Any error is passed on to the application rather than ending
+            # the thread, which would leave later images pending forever.
+            write_error = None
+            try:
+                self._write_key_images(key_images)
+            except Exception as error:
+                write_error = error
+            finally:
+                with self.write_condition:
+                    self.write_error = self.write_error or write_error
+                    self.write_in_progress = False
+                    self.write_condition.notify_all()
+
+    def _stop_writer(self):
+        """
+        Signals the background writer thread (if running) to stop, discarding
+        any pending images. The thread is not waited for, as this is called
+        from :func:`~StreamDeck.close` on threads that may hold the update
+        lock the writer needs to finish its current write.
+        """
+        with self.write_condition:
+            self.run_write_thread = False
+            self.pending_key_images.clear()
+            self.write_condition.notify_all()
+
+    def _setup_writer(self, enabled):
+        """
+        Sets up the internal background writer thread. If the thread already
+        exists and is being disabled, any pending images are sent before the
+        thread is terminated, and any error sending them is raised.
+
+        :param bool enabled: `True` if the writer thread should be running.
+        """
+        with self.write_condition:
+            if enabled == self.run_write_thread:
+                return
+
+            self.run_write_thread = enabled
+            self.write_condition.notify_all()
+
+        if self.write_thread is not None:
+            try:
+                self.write_thread.join()
+            except RuntimeError:
+                pass
+
+            self.write_thread = None
+
+        if enabled:
+            self.write_error = None
+            self.write_thread = threading.Thread(target=self._write)
+            self.write_thread.daemon = True
+            self.write_thread.start()
+        else:
+            with self.write_condition:
+                self._raise_write_error()
+
     def open(self):
         """
         Opens the device for input/output. This must be called prior to setting
-        or retrieving any device state.
+        or retrieving any device state. The first time the device is opened,
+        its serial number and firmware version are read and cached.
 
         .. seealso:: See :func:`~StreamDeck.close` for the corresponding close method.
         """
         self.device.open()
 
+        if self.cached_serial_number is None:
+            self.refresh_info()
+
+        self._invalidate_key_images()
         self._reset_key_stream()
-        self._setup_reader(self._read)
+
+        if self.shared_reader is None:
+            self._setup_reader(self._read)
 
     def close(self):
         """
-        Closes the device for input/output.
+        Closes the device for input/output. If the background writer is
+        enabled, it is stopped and any key images still queued for it are
+        discarded; use :func:`~StreamDeck.flush` first if they must be sent.
 
         .. seealso:: See :func:`~StreamDeck.open` for the corresponding open method.
         """
+        self._stop_writer()
+        self._invalidate_key_images()
         self.device.close()
 
     def is_open(self):
@@ -194,6 +646,74 @@ class StreamDeck(ABC):
         """
         return self.device.path()
 
+    def vendor_id(self):
+        """
+        Retrieves the USB Vendor ID of the attached StreamDeck.
+
+        :rtype: int
+        :return: USB Vendor ID of the attached device.
+        """
+        return self.device.vendor_id()
+
+    def product_id(self):
+        """
+        Retrieves the USB Product ID of the attached StreamDeck.
+
+        :rtype: int
+        :return: USB Product ID of the attached device.
+        """
+        return self.device.product_id()
+
+    def serial_number(self):
+        """
+        Retrieves the serial number of the attached StreamDeck, as reported
+        when the device was enumerated. Unlike :func:`~StreamDeck.get_serial_number`,
+        this does not require the device to be open, and does not communicate
+        with the device; this allows a specific StreamDeck to be found among
+        several attached devices without opening each of them.
+
+        :rtype: str
+        :return: String containing the serial number of the attached device,
+                 `None` if the transport could not determine it.
+        """
+        return self.device.serial_number()
+
+    def manufacturer(self):
+        """
+        Retrieves the manufacturer name of the attached StreamDeck, as reported
+        when the device was enumerated. This does not require the device to be
+        open.
+
+        :rtype: str
+        :return: String containing the manufacturer name of the attached
+                 device, `None` if the transport could not determine it.
+        """
+        return self.device.manufacturer()
+
+    def product_name(self):
+        """
+        Retrieves the product name of the attached StreamDeck, as reported
+        when the device was enumerated. This does not require the device to be
+        open.
+
+        :rtype: str
+        :return: String containing the product name of the attached device,
+                 `None` if the transport could not determine it.
+        """
+        return self.device.product()
+
+    def interface_number(self):
+        """
+        Retrieves the USB interface number of the attached StreamDeck, as
+        reported when the device was enumerated. This does not require the
+        device to be open.
+
+        :rtype: int
+        :return: USB interface number of the attached device, `None` if the
+                 transport could not determine it.
+        """
+        return self.device.interface_number()
+
     def key_count(self):
         """
         Retrieves number of physical buttons on the attached StreamDeck device.
@@ -252,15 +772,62 @@ class StreamDeck(ABC):
     def set_poll_frequency(self, hz):
         """
         Sets the frequency of the button polling reader thread, determining how
-        often the StreamDeck will be polled for button changes.
+        long the reader thread waits for button changes from the StreamDeck
+        before checking if it should terminate.
 
-        A higher frequency will result in a higher CPU usage, but a lower
-        latency between a physical button press and a event from the library.
+        Button changes are reported as soon as they are received regardless of
+        this frequency, so a higher frequency only results in a higher CPU usage
+        and a faster termination of the reader thread when the deck is closed.
 
         :param int hz: Reader thread frequency, in Hz (1-1000).
         """
         self.read_poll_hz = min(max(hz, 1), 1000)
 
+    def set_key_image_dedup(self, enabled):
+        """
+        Enables or disables de-duplication of key image updates. When enabled,
+        the StreamDeck remembers a digest of the last image sent to each button,
+        and skips sending an image that is identical to the one already shown.
+
+        .. note:: Only images set through this library instance are tracked.
+                  Closing or resetting the deck forgets all remembered images.
+
+        .. seealso:: See :func:`~StreamDeck.skipped_key_image_writes` method
+                     to retrieve the number of key image writes skipped.
+
+        :param bool enabled: `True` to skip unchanged key images, `False` to
+                             always send them.
+        """
+        with self.update_lock:
+            self.key_image_digests = dict() if enabled else None
+
+    def set_background_writer(self, enabled):
+        """
+        Enables or disables the background writer thread of the StreamDeck.
+        When enabled, :func:`~StreamDeck.set_key_image` and
+        :func:`~StreamDeck.set_key_images` only queue the new images and return
+        immediately, leaving the background thread to send them to the device.
+        Only the most recent image queued for each key is kept, so that stale
+        images are never sent when images are set faster than the device can
+        accept them.
+
+        .. note:: Queued image data must not be modified until it has been sent.
+                  Other deck operations (such as :func:`~StreamDeck.reset`)
+                  are not queued, use :func:`~StreamDeck.flush` first if they
+                  must happen after the pending images are sent.
+
+        .. note:: Disabling the background writer sends any pending images
+                  before it returns. Errors sending queued images are raised
+                  from the next call to :func:`~StreamDeck.flush`,
+                  :func:`~StreamDeck.set_key_image` or
+                  :func:`~StreamDeck.set_key_images`, or when the background
+                  writer is disabled.
+
+        :param bool enabled: `True` to send key images from a background
+                             thread, `False` to send them immediately.
+        """
+        self._setup_writer(enabled)
+
     def set_key_callback(self, callback):
         """
         Sets the callback function called each time a button on the StreamDeck
@@ -316,6 +883,19 @@ class StreamDeck(ABC):
         """
         return self.last_key_states
 
+    def skipped_key_image_writes(self):
+        """
+        Retrieves the number of key image writes that were skipped because the
+        image was unchanged, while key image de-duplication was enabled.
+
+        .. seealso:: See :func:`~StreamDeck.set_key_image_dedup` method to
+                     enable key image de-duplication.
+
+        :rtype: int
+        :return: Number of key image writes skipped.
+        """
+        return self.skipped_key_image_count
+
     @abstractmethod
     def reset(self):
         """
@@ -335,27 +915,90 @@ class StreamDeck(ABC):
         """
         pass
 
-    @abstractmethod
+    def refresh_info(self):
+        """
+        Reads the serial number and firmware version of the attached StreamDeck
+        from the device, replacing the values cached when the deck was first
+        opened.
+
+        .. seealso:: See :func:`~StreamDeck.get_serial_number` and
+                     :func:`~StreamDeck.get_firmware_version` to retrieve the
+                     cached values.
+        """
+        serial_number = self._read_serial_number()
+        firmware_version = self._read_firmware_version()
+
+        self.cached_serial_number = serial_number
+        self.cached_firmware_version = firmware_version
+
     def get_serial_number(self):
         """
-        Gets the serial number of the attached StreamDeck.
+        Gets the serial number of the attached StreamDeck. This is read from
+        the device when it is first opened, and cached thereafter.
+
+        .. seealso:: See :func:`~StreamDeck.refresh_info` to read the value
+                     from the device again.
 
         :rtype: str
         :return: String containing the serial number of the attached device.
         """
-        pass
+        if self.cached_serial_number is None:
+            self.refresh_info()
+
+        return self.cached_serial_number
 
-    @abstractmethod
     def get_firmware_version(self):
         """
-        Gets the firmware version of the attached StreamDeck.
+        Gets the firmware version of the attached StreamDeck. This is read from
+        the device when it is first opened, and cached thereafter.
+
+        .. seealso:: See :func:`~StreamDeck.refresh_info` to read the value
+                     from the device again.
 
         :rtype: str
         :return: String containing the firmware version of the attached device.
         """
-        pass
+        if self.cached_firmware_version is None:
+            self.refresh_info()
+
+        return self.cached_firmware_version
+
+    def prepare_key_image(self, image):
+        """
+        Pre-processes an image in the native format of the StreamDeck into the
+        padded image report payloads used to send it to the device. The
+        returned prepared image can be passed to :func:`~StreamDeck.set_key_image`
+        or :func:`~StreamDeck.set_key_images` in place of the raw image for any
+        key on this model of StreamDeck, skipping all splitting and copying of
+        the raw image data on each update.
+
+        This is useful for images that are shown repeatedly, such as the frames
+        of a looping animation.
+
+        :param enumerable image: Raw data of the image to prepare. If `None`,
+                                 a black image will be prepared.
+
+        :rtype: PreparedKeyImage
+        :return: Prepared key image, for use with this model of StreamDeck.
+        """
+
+        image = self._image_buffer(image)
+
+        body_length = self.IMAGE_REPORT_LENGTH - self.IMAGE_REPORT_HEADER_LENGTH
+        image_pages = self._key_image_pages(image)
+
+        data = bytearray(len(image_pages) * body_length)
+        for page_number, (payload_length, payload) in enumerate(image_pages):
+            data[page_number * body_length:page_number * body_length + payload_length] = payload
+
+        data = memoryview(data).toreadonly()
+
+        pages = []
+        for page_number, (payload_length, payload) in enumerate(image_pages):
+            pages.append((payload_length, data[page_number * body_length:(page_number + 1) * body_length]))
+
+        return PreparedKeyImage(type(self), tuple(pages), self._key_image_digest(image))
 
-    @abstractmethod
     def set_key_image(self, key, image):
         """
         Sets the image of a button on the StreamDeck to the given image. The
@@ -366,8 +1009,72 @@ class StreamDeck(ABC):
                      information on the image format accepted by the device.
 
         :param int key: Index of the button whose image is to be updated.
-        :param enumerable image: Raw data of the image to set on the button.
-                                 If `None`, the key will be cleared to a black
+        :param enumerable image: Raw data of the image to set on the button,
+                                 or a prepared image from
+                                 :func:`~StreamDeck.prepare_key_image`. If
+                                 `None`, the key will be cleared to a black
                                  color.
         """
-        pass
+
+        image = self._key_image_data(key, image)
+
+        self._submit_key_images([(key, image)])
+
+    def set_key_images(self, images):
+        """
+        Sets the images of several buttons on the StreamDeck at once. This is
+        equivalent to calling :func:`~StreamDeck.set_key_image` for each of
+        the given buttons, but takes the update lock only once and sends all of
+        the resulting image reports to the device in a single bulk write.
+
+        .. seealso:: See :func:`~StreamDeck.set_key_image` method to update the
+                     image displayed on a single StreamDeck button.
+
+        :param dict(int, enumerable) images: Mapping of button indexes to the
+                                             raw data (or prepared image) to
+                                             set on each button. An image of
+                                             `None` will clear that key to a
+                                             black color.
+        """
+
+        key_images = [(key, self._key_image_data(key, image)) for key, image in images.items()]
+
+        self._submit_key_images(key_images)
+
+    def clear_keys(self, keys=None):
+        """
+        Clears the images of several buttons on the StreamDeck to a black
+        color. The blank image is sent using image reports prepared on first
+        use, so clearing keys (for example when switching between pages of
+        buttons) does no image processing at all.
+
+        :param enumerable(int) keys: Indexes of the buttons to clear, `None` to
+                                     clear all buttons.
+        """
+
+        if keys is None:
+            keys = range(self.KEY_COUNT)
+
+        blank_key_image = self._blank_prepared_key_image()
+
+        self.set_key_images({key: blank_key_image for key in keys})
+
+    def flush(self):
+        """
+        Waits until all key images queued for the background writer thread have
+        been sent to the StreamDeck. Returns immediately if the background
+        writer is disabled.
+
+        If the background writer failed to send any images since the last
+        call, the error is raised here (or from the next call to
+        :func:`~StreamDeck.set_key_image` or :func:`~StreamDeck.set_key_images`,
+        whichever comes first).
+
+        .. seealso:: See :func:`~StreamDeck.set_background_writer` method to
+                     enable the background writer thread.
+        """
+        with self.write_condition:
+            while self.pending_key_images or self.write_in_progress:
+                self.write_condition.wait()
+
+            self._raise_write_error()
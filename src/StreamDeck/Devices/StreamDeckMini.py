@@ -5,6 +5,8 @@
 #         www.fourwalledcubicle.com
 #
 
+import struct
+
 from .StreamDeck import StreamDeck
 
 
@@ -29,9 +31,10 @@ class StreamDeckMini(StreamDeck):
     IMAGE_REPORT_LENGTH = 1024
     IMAGE_REPORT_HEADER_LENGTH = 16
     IMAGE_REPORT_PAYLOAD_LENGTH = IMAGE_REPORT_LENGTH - IMAGE_REPORT_HEADER_LENGTH
+    IMAGE_REPORT_HEADER = struct.Struct('<BBBBBB10x')
 
-    # 80 x 80 black BMP
-    BLANK_KEY_IMAGE = [
+    # 80 x 80 black BMP header, followed by the pixel data on first use
+    BLANK_KEY_IMAGE_HEADER = bytes((
         0x42, 0x4d, 0xf6, 0x3c, 0x00, 0x00, 0x00, 0x00,
         0x00, 0x00, 0x36, 0x00, 0x00, 0x00, 0x28, 0x00,
         0x00, 0x00, 0x48, 0x00, 0x00, 0x00, 0x48, 0x00,
@@ -39,18 +42,31 @@ class StreamDeckMini(StreamDeck):
         0x00, 0x00, 0xc0, 0x3c, 0x00, 0x00, 0xc4, 0x0e,
         0x00, 0x00, 0xc4, 0x0e, 0x00, 0x00, 0x00, 0x00,
         0x00, 0x00, 0x00, 0x00, 0x00, 0x00
-    ] + [0] * (KEY_PIXEL_WIDTH * KEY_PIXEL_HEIGHT * 3)
+    ))
+
+    def _create_blank_key_image(self):
+        """
+        Creates the raw image data of a blank (black) key, by appending black
+        pixel data to the BMP header.
 
-    def _read_key_states(self):
+        :rtype: bytes
+        :return: Blank key image in the native format of the StreamDeck.
+        """
+        return self.BLANK_KEY_IMAGE_HEADER + bytes(self.KEY_PIXEL_WIDTH * self.KEY_PIXEL_HEIGHT * 3)
+
+    def _read_key_states(self, timeout=None):
         """
         Reads the key states of the StreamDeck. This is used internally by
         :func:`~StreamDeck._read` to talk to the actual device.
 
+        :param int timeout: Maximum time to wait for a key report, in
+                            milliseconds, or `None` to return immediately.
+
         :rtype: list(bool)
         :return: Button states, with the origin at the top-left of the deck.
         """
 
-        states = self.device.read(1 + self.KEY_COUNT)
+        states = self.device.read(1 + self.KEY_COUNT, timeout)
         if states is None:
             return None
 
@@ -69,12 +85,29 @@ class StreamDeckMini(StreamDeck):
         payload[0] = 0x02
         self.device.write(payload)
 
+    def _write_image_report_header(self, report, key, page_number, payload_length, is_last):
+        """
+        Writes the header of a single key image report into the given report
+        buffer. This is used internally by :func:`~StreamDeck._key_image_reports`
+        to build the image reports sent to the actual device.
+
+        :param memoryview report: Report buffer to write the header into.
+        :param int key: Index of the button the image report is for.
+        :param int page_number: Index of the image page within the report sequence.
+        :param int payload_length: Number of image bytes in the report.
+        :param bool is_last: `True` if this is the final report of the image.
+        """
+
+        self.IMAGE_REPORT_HEADER.pack_into(report, 0, 0x02, 0x01, page_number, 0, is_last, key + 1)
+
     def reset(self):
         """
         Resets the StreamDeck, clearing all button images and showing the
         standby image.
         """
 
+        self._invalidate_key_images()
+
         payload = bytearray(17)
         payload[0:2] = [0x0B, 0x63]
         self.device.write_feature(payload)
@@ -97,9 +130,9 @@ class StreamDeckMini(StreamDeck):
         payload[0:6] = [0x05, 0x55, 0xaa, 0xd1, 0x01, percent]
         self.device.write_feature(payload)
 
-    def get_serial_number(self):
+    def _read_serial_number(self):
         """
-        Gets the serial number of the attached StreamDeck.
+        Reads the serial number of the attached StreamDeck from the device.
 
         :rtype: str
         :return: String containing the serial number of the attached device.
@@ -108,9 +141,9 @@ class StreamDeckMini(StreamDeck):
         serial = self.device.read_feature(0x03, 17)
         return self._extract_string(serial[5:])
 
-    def get_firmware_version(self):
+    def _read_firmware_version(self):
         """
-        Gets the firmware version of the attached StreamDeck.
+        Reads the firmware version of the attached StreamDeck from the device.
 
         :rtype: str
         :return: String containing the firmware version of the attached device.
@@ -118,55 +151,3 @@ class StreamDeckMini(StreamDeck):
 
         version = self.device.read_feature(0x04, 17)
         return self._extract_string(version[5:])
-
-    def set_key_image(self, key, image):
-        """
-        Sets the image of a button on the StreamDeck to the given image. The
-        image being set should be in the correct format for the device, as an
-        enumerable collection of bytes.
-
-        .. seealso:: See :func:`~StreamDeck.get_key_image_format` method for
-                     information on the image format accepted by the device.
-
-        :param int key: Index of the button whose image is to be updated.
-        :param enumerable image: Raw data of the image to set on the button.
-                                 If `None`, the key will be cleared to a black
-                                 color.
-        """
-
-        if min(max(key, 0), self.KEY_COUNT) != key:
-            raise IndexError("Invalid key index {}.".format(key))
-
-        image = bytes(image or self.BLANK_KEY_IMAGE)
-
-        page_number = 0
-        bytes_remaining = len(image)
-        while bytes_remaining > 0:
-            this_length = min(bytes_remaining, self.IMAGE_REPORT_PAYLOAD_LENGTH)
-            bytes_sent = page_number * self.IMAGE_REPORT_PAYLOAD_LENGTH
-
-            header = [
-                0x02,
-                0x01,
-                page_number,
-                0,
-                1 if this_length == bytes_remaining else 0,
-                key + 1,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-            ]
-
-            payload = bytes(header) + image[bytes_sent:bytes_sent + this_length]
-            padding = bytearray(self.IMAGE_REPORT_LENGTH - len(payload))
-            self.device.write(payload + padding)
-
-            bytes_remaining = bytes_remaining - this_length
-            page_number = page_number + 1
@@ -20,16 +20,19 @@ class StreamDeckPedal(StreamDeck):
     DECK_TYPE = "Stream Deck Pedal"
     DECK_VISUAL = False
 
-    def _read_key_states(self):
+    def _read_key_states(self, timeout=None):
         """
         Reads the key states of the StreamDeck. This is used internally by
         :func:`~StreamDeck._read` to talk to the actual device.
 
+        :param int timeout: Maximum time to wait for a key report, in
+                            milliseconds, or `None` to return immediately.
+
         :rtype: list(bool)
         :return: Button states, with the origin at the top-left of the deck.
         """
 
-        states = self.device.read(4 + self.KEY_COUNT)
+        states = self.device.read(4 + self.KEY_COUNT, timeout)
         if states is None:
             return None
 
@@ -45,6 +48,20 @@ class StreamDeckPedal(StreamDeck):
         """
         pass
 
+    def _write_image_report_header(self, report, key, page_number, payload_length, is_last):
+        """
+        Writes the header of a single key image report into the given report
+        buffer. This is used internally by :func:`~StreamDeck._key_image_reports`
+        to build the image reports sent to the actual device.
+
+        :param memoryview report: Report buffer to write the header into.
+        :param int key: Index of the button the image report is for.
+        :param int page_number: Index of the image page within the report sequence.
+        :param int payload_length: Number of image bytes in the report.
+        :param bool is_last: `True` if this is the final report of the image.
+        """
+        pass
+
     def reset(self):
         """
         Resets the StreamDeck, clearing all button images and showing the
@@ -62,13 +79,20 @@ class StreamDeckPedal(StreamDeck):
         """
         pass
 
-    def get_serial_number(self):
+    def _read_serial_number(self):
+        """
+        Reads the serial number of the attached StreamDeck from the device.
+
+        :rtype: str
+        :return: String containing the serial number of the attached device.
+        """
+
         serial = self.device.read_feature(0x06, 32)
         return self._extract_string(serial[2:])
 
-    def get_firmware_version(self):
+    def _read_firmware_version(self):
         """
-        Gets the firmware version of the attached StreamDeck.
+        Reads the firmware version of the attached StreamDeck from the device.
 
         :rtype: str
         :return: String containing the firmware version of the attached device.
@@ -77,6 +101,19 @@ class StreamDeckPedal(StreamDeck):
         version = self.device.read_feature(0x05, 32)
         return self._extract_string(version[6:])
 
+    def prepare_key_image(self, image):
+        """
+        Pre-processes an image in the native format of the StreamDeck into the
+        padded image report payloads used to send it to the device.
+
+        :param enumerable image: Raw data of the image to prepare. If `None`,
+                                 a black image will be prepared.
+
+        :rtype: PreparedKeyImage
+        :return: Prepared key image, for use with this model of StreamDeck.
+        """
+        pass
+
     def set_key_image(self, key, image):
         """
         Sets the image of a button on the StreamDeck to the given image. The
@@ -92,3 +129,28 @@ class StreamDeckPedal(StreamDeck):
                                  color.
         """
         pass
+
+    def set_key_images(self, images):
+        """
+        Sets the images of several buttons on the StreamDeck at once.
+
+        .. seealso:: See :func:`~StreamDeck.set_key_image` method to update the
+                     image displayed on a single StreamDeck button.
+
+        :param dict(int, enumerable) images: Mapping of button indexes to the
+                                             raw data of the image to set on
+                                             each button. An image of `None`
+                                             will clear that key to a black
+                                             color.
+        """
+        pass
+
+    def clear_keys(self, keys=None):
+        """
+        Clears the images of several buttons on the StreamDeck to a black
+        color.
+
+        :param enumerable(int) keys: Indexes of the buttons to clear, `None` to
+                                     clear all buttons.
+        """
+        pass
@@ -5,6 +5,8 @@
 #         www.fourwalledcubicle.com
 #
 
+import struct
+
 from .StreamDeck import StreamDeck
 
 
@@ -29,9 +31,10 @@ class StreamDeckXL(StreamDeck):
     IMAGE_REPORT_LENGTH = 1024
     IMAGE_REPORT_HEADER_LENGTH = 8
     IMAGE_REPORT_PAYLOAD_LENGTH = IMAGE_REPORT_LENGTH - IMAGE_REPORT_HEADER_LENGTH
+    IMAGE_REPORT_HEADER = struct.Struct('<BBBBHH')
 
     # 96 x 96 black JPEG
-    BLANK_KEY_IMAGE = [
+    BLANK_KEY_IMAGE = bytes((
         0xff, 0xd8, 0xff, 0xe0, 0x00, 0x10, 0x4a, 0x46, 0x49, 0x46, 0x00, 0x01, 0x01, 0x00, 0x00, 0x01, 0x00, 0x01, 0x00,
         0x00, 0xff, 0xdb, 0x00, 0x43, 0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09, 0x09, 0x08,
         0x0a, 0x0c, 0x14, 0x0d, 0x0c, 0x0b, 0x0b, 0x0c, 0x19, 0x12, 0x13, 0x0f, 0x14, 0x1d, 0x1a, 0x1f, 0x1e, 0x1d, 0x1a,
@@ -73,18 +76,21 @@ class StreamDeckXL(StreamDeck):
         0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02,
         0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0,
         0x02, 0x8a, 0x28, 0xa0, 0x02, 0x8a, 0x28, 0xa0, 0x0f, 0xff, 0xd9
-    ]
+    ))
 
-    def _read_key_states(self):
+    def _read_key_states(self, timeout=None):
         """
         Reads the key states of the StreamDeck. This is used internally by
         :func:`~StreamDeck._read` to talk to the actual device.
 
+        :param int timeout: Maximum time to wait for a key report, in
+                            milliseconds, or `None` to return immediately.
+
         :rtype: list(bool)
         :return: Button states, with the origin at the top-left of the deck.
         """
 
-        states = self.device.read(4 + self.KEY_COUNT)
+        states = self.device.read(4 + self.KEY_COUNT, timeout)
         if states is None:
             return None
 
@@ -103,12 +109,29 @@ class StreamDeckXL(StreamDeck):
         payload[0] = 0x02
         self.device.write(payload)
 
+    def _write_image_report_header(self, report, key, page_number, payload_length, is_last):
+        """
+        Writes the header of a single key image report into the given report
+        buffer. This is used internally by :func:`~StreamDeck._key_image_reports`
+        to build the image reports sent to the actual device.
+
+        :param memoryview report: Report buffer to write the header into.
+        :param int key: Index of the button the image report is for.
+        :param int page_number: Index of the image page within the report sequence.
+        :param int payload_length: Number of image bytes in the report.
+        :param bool is_last: `True` if this is the final report of the image.
+        """
+
+        self.IMAGE_REPORT_HEADER.pack_into(report, 0, 0x02, 0x07, key, is_last, payload_length, page_number)
+
     def reset(self):
         """
         Resets the StreamDeck, clearing all button images and showing the
         standby image.
         """
 
+        self._invalidate_key_images()
+
         payload = bytearray(32)
         payload[0:2] = [0x03, 0x02]
         self.device.write_feature(payload)
@@ -131,9 +154,9 @@ class StreamDeckXL(StreamDeck):
         payload[0:2] = [0x03, 0x08, percent]
         self.device.write_feature(payload)
 
-    def get_serial_number(self):
+    def _read_serial_number(self):
         """
-        Gets the serial number of the attached StreamDeck.
+        Reads the serial number of the attached StreamDeck from the device.
 
         :rtype: str
         :return: String containing the serial number of the attached device.
@@ -142,9 +165,9 @@ class StreamDeckXL(StreamDeck):
         serial = self.device.read_feature(0x06, 32)
         return self._extract_string(serial[2:])
 
-    def get_firmware_version(self):
+    def _read_firmware_version(self):
         """
-        Gets the firmware version of the attached StreamDeck.
+        Reads the firmware version of the attached StreamDeck from the device.
 
         :rtype: str
         :return: String containing the firmware version of the attached device.
@@ -152,47 +175,3 @@ class StreamDeckXL(StreamDeck):
 
         version = self.device.read_feature(0x05, 32)
         return self._extract_string(version[6:])
-
-    def set_key_image(self, key, image):
-        """
-        Sets the image of a button on the StreamDeck to the given image. The
-        image being set should be in the correct format for the device, as an
-        enumerable collection of bytes.
-
-        .. seealso:: See :func:`~StreamDeck.get_key_image_format` method for
-                     information on the image format accepted by the device.
-
-        :param int key: Index of the button whose image is to be updated.
-        :param enumerable image: Raw data of the image to set on the button.
-                                 If `None`, the key will be cleared to a black
-                                 color.
-        """
-
-        if min(max(key, 0), self.KEY_COUNT) != key:
-            raise IndexError("Invalid key index {}.".format(key))
-
-        image = bytes(image or self.BLANK_KEY_IMAGE)
-
-        page_number = 0
-        bytes_remaining = len(image)
-        while bytes_remaining > 0:
-            this_length = min(bytes_remaining, self.IMAGE_REPORT_PAYLOAD_LENGTH)
-            bytes_sent = page_number * self.IMAGE_REPORT_PAYLOAD_LENGTH
-
-            header = [
-                0x02,
-                0x07,
-                key,
-                1 if this_length == bytes_remaining else 0,
-                this_length & 0xFF,
-                this_length >> 8,
-                page_number & 0xFF,
-                page_number >> 8
-            ]
-
-            payload = bytes(header) + image[bytes_sent:bytes_sent + this_length]
-            padding = bytearray(self.IMAGE_REPORT_LENGTH - len(payload))
-            self.device.write(payload + padding)
-
-            bytes_remaining = bytes_remaining - this_length
-            page_number = page_number + 1
@@ -0,0 +1,331 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import errno
+import logging
+import select
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class HotplugSource(ABC):
+    """
+    Base hotplug event source, representing an abstract source of notifications
+    that devices may have been attached to or removed from the host.
+    """
+
+    @abstractmethod
+    def wait(self):
+        """
+        Blocks until devices may have been attached to or removed from the host,
+        or until the source is closed.
+
+        :rtype: bool
+        :return: `True` if the attached devices may have changed, `False` if
+                 the source was closed.
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """
+        Closes the event source, waking up any thread blocked in
+        :func:`~HotplugSource.wait`.
+        """
+        pass
+
+
+class PollingHotplugSource(HotplugSource):
+    """
+    Hotplug event source that signals a possible change at a fixed interval,
+    so that the attached devices are periodically re-enumerated. This works on
+    all systems, and is used when no native event source is available.
+    """
+
+    def __init__(self, interval=1.0):
+        """
+        Creates a new polling hotplug event source.
+
+        :param float interval: Time between each poll, in seconds.
+        """
+        self.interval = interval
+        self.close_event = threading.Event()
+
+    def wait(self):
+        return not self.close_event.wait(self.interval)
+
+    def close(self):
+        self.close_event.set()
+
+
+class NetlinkHotplugSource(HotplugSource):
+    """
+    Hotplug event source using the Linux kernel's uevent netlink socket, which
+    signals a change only when a USB or HID device is actually attached or
+    removed. If the kernel drops events because they arrive faster than they
+    are read, a change is signalled so that no attach or removal is missed.
+    """
+
+    NETLINK_KOBJECT_UEVENT = 15
+    UEVENT_SUBSYSTEMS = {b'usb', b'hid', b'hidraw'}
+    UEVENT_ACTIONS = {b'add', b'remove'}
+
+    def __init__(self, settle_time=0.1):
+        """
+        Creates a new netlink hotplug event source. Raises an `OSError` if the
+        host does not support netlink sockets.
+
+        :param float settle_time: Time to wait for further events after each
+                                  event, so that the several events sent when
+                                  a single device is attached are coalesced.
+        """
+        if not hasattr(socket, 'AF_NETLINK'):
+            raise OSError("Netlink sockets are not supported on this system.")
+
+        self.settle_time = settle_time
+        self.closed = False
+
+        self.socket = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_KOBJECT_UEVENT)
+        self.socket.bind((0, 1))
+
+    def _read_event(self, timeout):
+        """
+        Reads the next uevent from the kernel, waiting up to the given timeout.
+
+        :param float timeout: Maximum time to wait for an event, in seconds.
+
+        :rtype: bool
+        :return: `True` if a USB or HID device attach or removal event was
+                 read, `False` otherwise.
+        """
+        ready, _, _ = select.select([self.socket], [], [], timeout)
+        if not ready:
+            return False
+
+        message = self.socket.recv(8192)
+        fields = dict(f.partition(b'=')[::2] for f in message.split(b'\0') if b'=' in f)
+
+        return fields.get(b'ACTION') in self.UEVENT_ACTIONS and fields.get(b'SUBSYSTEM') in self.UEVENT_SUBSYSTEMS
+
+    def wait(self):
+        while not self.closed:
+            try:
+                if not self._read_event(0.25):
+                    continue
+
+                settle_end = time.monotonic() + self.settle_time
+                while time.monotonic() < settle_end and not self.closed:
+                    self._read_event(max(settle_end - time.monotonic(), 0))
+
+                return not self.closed
+            except (OSError, ValueError) as error:
+                if self.closed:
+                    break
+
+                # The socket's receive buffer overflowed during a burst of
+                # events, so the attached devices must be re-enumerated.
+                if isinstance(error, OSError) and error.errno == errno.ENOBUFS:
+                    return True
+
+                raise
+
+        return False
+
+    def close(self):
+        self.closed = True
+        self.socket.close()
+
+
+class HotplugWatcher:
+    """
+    Hotplug watcher, maintaining a cached set of the paths of attached devices
+    and notifying registered callbacks when devices are attached or removed.
+    The set of devices is re-enumerated from a background thread each time the
+    watcher's event source signals that the attached devices may have changed,
+    so that checking if a device is attached is a simple lookup.
+
+    .. seealso:: See :func:`~DeviceManager.start_hotplug_watcher` to create a
+                 watcher for the StreamDeck devices of a device manager.
+    """
+
+    def __init__(self, enumerate_paths, source=None):
+        """
+        Creates a new hotplug watcher.
+
+        :param function enumerate_paths: Function returning the paths of all
+                                         currently attached devices.
+        :param HotplugSource source: Event source to use, `None` to use the
+                                     best available source for the host.
+        """
+        self.enumerate_paths = enumerate_paths
+        self.source = source
+        self.attached_paths = frozenset()
+        self.callbacks = []
+        self.watch_thread = None
+
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def default_source():
+        """
+        Creates the best available hotplug event source for the host.
+
+        :rtype: HotplugSource
+        :return: Netlink event source if supported by the host, otherwise a
+                 polling event source.
+        """
+        try:
+            return NetlinkHotplugSource()
+        except OSError:
+            return PollingHotplugSource()
+
+    def _rescan(self):
+        """
+        Re-enumerates the attached devices, updating the cached set of device
+        paths and firing off the registered callbacks for each change.
+        """
+        attached_paths = frozenset(self.enumerate_paths())
+
+        with self.lock:
+            added = attached_paths - self.attached_paths
+            removed = self.attached_paths - attached_paths
+            self.attached_paths = attached_paths
+            callbacks = list(self.callbacks)
+
+        changes = [(path, False) for path in removed] + [(path, True) for path in added]
+
+        for callback in callbacks:
+            for path, attached in changes:
+                try:
+                    callback(path, attached)
+                except Exception:
+                    logging.exception("Hotplug watcher callback failed.")
+
+    def _watch(self, source):
+        """
+        Watcher thread, re-enumerating the attached devices each time the event
+        source signals a possible change until the source is closed. Errors
+        enumerating the devices are logged, and the devices enumerated again
+        on the next change; if the event source itself fails, the watcher
+        stops.
+
+        :param HotplugSource source: Event source to wait on.
+        """
+        while True:
+            try:
+                if not source.wait():
+                    break
+            except Exception:
+                logging.exception("Hotplug watcher event source failed, stopping watcher.")
+                break
+
+            try:
+                self._rescan()
+            except Exception:
+                logging.exception("Hotplug watcher failed to enumerate attached devices.")
+
+    def start(self):
+        """
+        Starts the watcher. The attached devices are enumerated once before
+        this returns, so that the cached set of devices is immediately valid.
+        If that enumeration fails, the event source is closed and the error
+        is raised, leaving the watcher stopped.
+
+        .. seealso:: See :func:`~HotplugWatcher.stop` for the corresponding stop method.
+        """
+        if self.watch_thread is not None:
+            return
+
+        self.source = self.source or self.default_source()
+
+        try:
+            self._rescan()
+        except Exception:
+            self.source.close()
+            self.source = None
+            raise
+
+        self.watch_thread = threading.Thread(target=self._watch, args=[self.source])
+        self.watch_thread.daemon = True
+        self.watch_thread.start()
+
+    def stop(self):
+        """
+        Stops the watcher, closing its event source.
+
+        .. seealso:: See :func:`~HotplugWatcher.start` for the corresponding start method.
+        """
+        if self.watch_thread is None:
+            return
+
+        self.source.close()
+        self.source = None
+
+        if self.watch_thread is not threading.current_thread():
+            try:
+                self.watch_thread.join()
+            except RuntimeError:
+                pass
+
+        self.watch_thread = None
+
+    def is_running(self):
+        """
+        Indicates if the watcher is currently running, and so if its cached set
+        of attached devices is being kept up to date.
+
+        :rtype: bool
+        :return: `True` if the watcher is running, `False` otherwise.
+        """
+        return self.watch_thread is not None and self.watch_thread.is_alive()
+
+    def is_attached(self, path):
+        """
+        Indicates if a device with the given path is currently attached.
+
+        :param str path: Logical path of the device.
+
+        :rtype: bool
+        :return: `True` if the device is attached, `False` otherwise.
+        """
+        return path in self.attached_paths
+
+    def paths(self):
+        """
+        Retrieves the paths of all currently attached devices.
+
+        :rtype: frozenset(str)
+        :return: Set of logical paths of the attached devices.
+        """
+        return self.attached_paths
+
+    def add_callback(self, callback):
+        """
+        Registers a callback function, called each time a device is attached
+        or removed.
+
+        .. note:: This callback will be fired from an internal watcher thread.
+                  Ensure that the given callback function is thread-safe.
+
+        :param function callback: Callback function taking the path of the
+                                  device, and `True` if the device was attached
+                                  or `False` if it was removed.
+        """
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        Removes a previously registered callback function.
+
+        :param function callback: Callback function to remove.
+        """
+        with self.lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
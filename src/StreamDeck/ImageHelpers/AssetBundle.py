@@ -0,0 +1,268 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import mmap
+import os
+import struct
+import tempfile
+
+from ..Devices.StreamDeck import PreparedKeyImage
+from . import PILHelper
+
+
+# Bundle file header, followed by the name of the StreamDeck model class.
+_BUNDLE_HEADER = struct.Struct('<8sIIIH')
+_BUNDLE_MAGIC = b'SDBUNDLE'
+_BUNDLE_VERSION = 1
+
+# Index entry of each asset, followed by the asset name.
+_ASSET_HEADER = struct.Struct('<HIQ')
+
+# Frame table entry of each frame, followed by the payload length of each of
+# the frame's image report pages.
+_FRAME_HEADER = struct.Struct('<d16sIQ')
+_PAGE_LENGTH = struct.Struct('<I')
+
+
+def _page_length(deck):
+    """
+    Retrieves the padded length of each image report page of a StreamDeck.
+
+    :param StreamDeck deck: StreamDeck device to query.
+
+    :rtype: int
+    :return: Length of each page, in bytes.
+    """
+    return deck.IMAGE_REPORT_LENGTH - deck.IMAGE_REPORT_HEADER_LENGTH
+
+
+def pack(deck, directory, path, margins=[0, 0, 0, 0], background='black', workers=1):
+    """
+    Packs all of the images (including animated images, such as GIFs) in a
+    directory into an asset bundle for a model of StreamDeck. Each frame of
+    each image is scaled to fit the deck's keys, converted to the deck's native
+    image format and split into the deck's image report pages, so that loading
+    the bundle requires no further processing.
+
+    Assets in the bundle are named after the image file they were created
+    from. Files in the directory that are not images are ignored.
+
+    .. seealso:: See :class:`~AssetBundle` to load the created bundle.
+
+    :param StreamDeck deck: StreamDeck device to generate the bundle for; the
+                            bundle can be used with any deck of the same model.
+    :param str directory: Path of the directory of images to pack.
+    :param str path: Path of the bundle file to create.
+    :param list(int): Array of margin pixels in (top, right, bottom, left) order.
+    :param str background: Background color to use, compatible with `PIL.Image.new()`.
+    :param int workers: Number of worker processes used to convert the frames,
+                        as per :func:`~PILHelper.to_native_format_many`.
+
+    :rtype: list(str)
+    :return: Names of the packed assets.
+    """
+    from PIL import Image
+
+    assets = []
+    for filename in sorted(os.listdir(directory)):
+        file_path = os.path.join(directory, filename)
+        if not os.path.isfile(file_path):
+            continue
+
+        try:
+            image = Image.open(file_path)
+        except OSError:
+            continue
+
+        with image:
+            frames = PILHelper.to_native_animation(deck, image, margins=margins, background=background, workers=workers)
+
+        assets.append((filename, [(deck.prepare_key_image(frame), duration) for frame, duration in frames]))
+
+    model_name = type(deck).__name__.encode('utf-8')
+    page_length = _page_length(deck)
+
+    # Lay out the bundle as the header, the asset index, the frame tables of
+    # all assets and finally the image report pages of all frames.
+    index_offset = _BUNDLE_HEADER.size + len(model_name)
+    frame_table_offset = index_offset + sum(_ASSET_HEADER.size + len(name.encode('utf-8')) for name, _ in assets)
+    pages_offset = frame_table_offset + sum(_FRAME_HEADER.size + len(image.pages) * _PAGE_LENGTH.size for _, frames in assets for image, _ in frames)
+
+    index = []
+    frame_tables = []
+    pages = []
+    for name, frames in assets:
+        index.append(_ASSET_HEADER.pack(len(name.encode('utf-8')), len(frames), frame_table_offset))
+        index.append(name.encode('utf-8'))
+
+        for image, duration in frames:
+            frame_tables.append(_FRAME_HEADER.pack(duration, image.digest, len(image.pages), pages_offset))
+
+            for payload_length, page in image.pages:
+                frame_tables.append(_PAGE_LENGTH.pack(payload_length))
+                pages.append(page)
+
+            frame_table_offset += _FRAME_HEADER.size + len(image.pages) * _PAGE_LENGTH.size
+            pages_offset += len(image.pages) * page_length
+
+    # The bundle is written to a new file that then replaces any existing
+    # bundle, as the existing bundle may be memory-mapped by a loaded
+    # AssetBundle, and must not be modified in place.
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=filename + '.')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_BUNDLE_HEADER.pack(_BUNDLE_MAGIC, _BUNDLE_VERSION, page_length, len(assets), len(model_name)))
+            f.write(model_name)
+            f.writelines(index)
+            f.writelines(frame_tables)
+            f.writelines(pages)
+
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+    return [name for name, _ in assets]
+
+
+class AssetBundle:
+    """
+    Asset bundle created by :func:`~pack`, holding key images and animations
+    already split into the image report pages of a model of StreamDeck.
+
+    The bundle file is memory-mapped when loaded, and its frames are returned
+    as prepared key images whose pages are views into the mapping. These can
+    be passed directly to :func:`~StreamDeck.set_key_image`,
+    :func:`~StreamDeck.set_key_images` or :func:`~Animator.set_key_animation`,
+    without any image data being read or copied until it is sent.
+    """
+
+    def __init__(self, path):
+        """
+        Loads an asset bundle.
+
+        :param str path: Path of the bundle file.
+        """
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = memoryview(self.map)
+
+        if len(data) < _BUNDLE_HEADER.size:
+            raise ValueError("File \"{}\" is not a supported asset bundle.".format(path))
+
+        magic, version, self.page_length, asset_count, model_name_length = _BUNDLE_HEADER.unpack_from(data)
+        if magic != _BUNDLE_MAGIC or version != _BUNDLE_VERSION:
+            raise ValueError("File \"{}\" is not a supported asset bundle.".format(path))
+
+        offset = _BUNDLE_HEADER.size
+        self.model_name = bytes(data[offset:offset + model_name_length]).decode('utf-8')
+        offset += model_name_length
+
+        self.assets = dict()
+        for _ in range(asset_count):
+            name_length, frame_count, frame_table_offset = _ASSET_HEADER.unpack_from(data, offset)
+            offset += _ASSET_HEADER.size
+
+            name = bytes(data[offset:offset + name_length]).decode('utf-8')
+            offset += name_length
+
+            self.assets[name] = (frame_count, frame_table_offset)
+
+        self.data = data
+        self.frames = dict()
+
+    def close(self):
+        """
+        Closes the bundle, releasing its mapping of the bundle file once all
+        key images retrieved from it are no longer in use.
+        """
+        self.assets = dict()
+        self.frames = dict()
+        self.data.release()
+
+        # Key images still in use keep the mapping alive until they are
+        # released, so it is dropped rather than closed.
+        self.map = None
+
+    def _check_deck(self, deck):
+        """
+        Checks that a StreamDeck is of the model the bundle was created for.
+
+        :param StreamDeck deck: StreamDeck device to check.
+        """
+        if type(deck).__name__ != self.model_name or _page_length(deck) != self.page_length:
+            raise ValueError("Asset bundle was created for a different StreamDeck model ({}).".format(self.model_name))
+
+    def model(self):
+        """
+        Retrieves the name of the StreamDeck model class the bundle was
+        created for.
+
+        :rtype: str
+        :return: Name of the StreamDeck model class.
+        """
+        return self.model_name
+
+    def names(self):
+        """
+        Retrieves the names of all assets in the bundle.
+
+        :rtype: list(str)
+        :return: Names of the assets in the bundle.
+        """
+        return list(self.assets.keys())
+
+    def key_frames(self, deck, name):
+        """
+        Retrieves all frames of an asset in the bundle.
+
+        :param StreamDeck deck: StreamDeck device the frames are to be shown on.
+        :param str name: Name of the asset to retrieve.
+
+        :rtype: list((PreparedKeyImage, float))
+        :return: List of frames, each a pair of the frame's prepared key image
+                 and its display duration in seconds.
+        """
+        self._check_deck(deck)
+
+        frames = self.frames.get(name)
+        if frames is None:
+            frame_count, offset = self.assets[name]
+
+            frames = []
+            for _ in range(frame_count):
+                duration, digest, page_count, pages_offset = _FRAME_HEADER.unpack_from(self.data, offset)
+                offset += _FRAME_HEADER.size
+
+                pages = []
+                for page_number in range(page_count):
+                    payload_length, = _PAGE_LENGTH.unpack_from(self.data, offset)
+                    offset += _PAGE_LENGTH.size
+
+                    page_offset = pages_offset + page_number * self.page_length
+                    pages.append((payload_length, self.data[page_offset:page_offset + self.page_length]))
+
+                frames.append((PreparedKeyImage(type(deck), tuple(pages), digest), duration))
+
+            self.frames[name] = frames
+
+        return frames
+
+    def key_image(self, deck, name):
+        """
+        Retrieves the first (or only) frame of an asset in the bundle.
+
+        :param StreamDeck deck: StreamDeck device the image is to be shown on.
+        :param str name: Name of the asset to retrieve.
+
+        :rtype: PreparedKeyImage
+        :return: Prepared key image of the asset's first frame.
+        """
+        return self.key_frames(deck, name)[0][0]
@@ -0,0 +1,286 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import itertools
+import struct
+
+
+# BMP file header and BITMAPINFOHEADER for an uncompressed 24-bit image, as
+# written by PIL (including its default resolution of 96 DPI).
+_BMP_HEADER = struct.Struct('<2sIHHIIiiHHIIiiII')
+_BMP_PIXELS_PER_METER = 3780
+
+# Cached plane transformations for each key image rotation and mirroring, see
+# `_plane_transform()`.
+_PLANE_TRANSFORMS = dict()
+
+
+def _bmp_header(width, height):
+    """
+    Creates the header of an uncompressed 24-bit BMP image.
+
+    :param int width: Width of the image, in pixels.
+    :param int height: Height of the image, in pixels.
+
+    :rtype: bytes
+    :return: BMP file and info headers.
+    """
+    image_size = ((width * 3 + 3) & ~3) * height
+
+    return _BMP_HEADER.pack(
+        b'BM', _BMP_HEADER.size + image_size, 0, 0, _BMP_HEADER.size,
+        40, width, height, 1, 24, 0, image_size,
+        _BMP_PIXELS_PER_METER, _BMP_PIXELS_PER_METER, 0, 0)
+
+
+def _transform_lines(data, width, height, pixel_size, transform):
+    """
+    Rearranges row-major pixel data by an optional transpose, followed by
+    optional reversals of the row order and the order of the pixels within
+    each row. Each output row is produced by a single slice of the input, so
+    that all pixel copying is done by Python's built-in slicing.
+
+    :param bytes data: Pixel data, stored row by row.
+    :param int width: Width of the image, in pixels.
+    :param int height: Height of the image, in pixels.
+    :param int pixel_size: Size of each pixel in bytes; must be 1 if the data
+                           is to be transposed.
+    :param (bool, bool, bool) transform: Whether to transpose, reverse the rows
+                                         and reverse the columns.
+
+    :rtype: (bytes, int, int)
+    :return: Transformed pixel data, and its new width and height.
+    """
+    transpose, flip_rows, flip_columns = transform
+
+    if transpose:
+        # Each output row is a column of the input, read with a stride of one
+        # input row (in either direction).
+        if flip_columns:
+            lines = (data[(height - 1) * width + c::-width] for c in range(width))
+        else:
+            lines = (data[c::width] for c in range(width))
+
+        if flip_rows:
+            lines = reversed(list(lines))
+
+        return b''.join(lines), height, width
+
+    # Reversing all of the data reverses both the rows and the columns, which
+    # is much faster than reversing each row separately.
+    if flip_columns:
+        data = data[::-1]
+        flip_rows = not flip_rows
+
+    if not flip_rows:
+        return data, width, height
+
+    row_length = width * pixel_size
+    return b''.join(data[r * row_length:(r + 1) * row_length] for r in reversed(range(height))), width, height
+
+
+def _plane_transform(rotation, flip):
+    """
+    Determines how to transform an image's pixel data into the bottom-up row
+    order of a BMP image, after applying the given key image rotation and
+    mirroring. The transformation is reduced to an optional transpose
+    followed by optional reversals of the row order and the pixel order
+    within each row.
+
+    :param int rotation: Counter-clockwise rotation of the image, in degrees.
+    :param (bool, bool) flip: Horizontal and vertical mirroring of the image.
+
+    :rtype: (bool, bool, bool)
+    :return: Whether to transpose, reverse the rows and reverse the columns.
+    """
+    key = (rotation, tuple(flip))
+
+    transform = _PLANE_TRANSFORMS.get(key)
+    if transform is None:
+        if (rotation or 0) % 90:
+            raise ValueError("Key image rotation of {} degrees is not supported.".format(rotation))
+
+        # Apply each step to a small test pattern, then find the equivalent
+        # reduced transformation.
+        pattern = (bytes(range(6)), 3, 2)
+
+        def step(pattern, transform):
+            return _transform_lines(pattern[0], pattern[1], pattern[2], 1, transform)
+
+        transformed = pattern
+        for _ in range((rotation or 0) // 90 % 4):
+            transformed = step(transformed, (True, True, False))
+
+        if flip[0]:
+            transformed = step(transformed, (False, False, True))
+
+        if flip[1]:
+            transformed = step(transformed, (False, True, False))
+
+        transformed = step(transformed, (False, True, False))
+
+        transform = next(t for t in itertools.product([False, True], repeat=3) if step(pattern, t) == transformed)
+        _PLANE_TRANSFORMS[key] = transform
+
+    return transform
+
+
+def _encode_numpy(image_format, transform, pixels):
+    """
+    Encodes a NumPy array of RGB pixels into a BMP image, using array views
+    for the pixel transformation.
+
+    :rtype: bytes
+    :return: BMP image data.
+    """
+    import numpy
+
+    width, height = image_format['size']
+    transpose, flip_rows, flip_columns = transform
+
+    pixels = numpy.asarray(pixels, dtype=numpy.uint8).reshape(height, width, 3)
+
+    if transpose:
+        pixels = pixels.transpose(1, 0, 2)
+        width, height = height, width
+
+    if flip_rows:
+        pixels = pixels[::-1]
+
+    if flip_columns:
+        pixels = pixels[:, ::-1]
+
+    # BMP pixels are stored in BGR order, with each row padded to 4 bytes.
+    # Copying one color plane at a time into a contiguous array is much faster
+    # than copying the strided (and possibly transposed) view all at once.
+    row_length = width * 3
+    data = numpy.zeros((height, row_length + (-row_length % 4)), dtype=numpy.uint8)
+
+    bgr_pixels = data[:, :row_length].reshape(height, width, 3)
+    for channel in range(3):
+        bgr_pixels[:, :, 2 - channel] = pixels[:, :, channel]
+
+    return _bmp_header(width, height) + data.tobytes()
+
+
+def _pixel_bytes(image_format, pixels):
+    """
+    Copies a buffer of RGB pixels into a bytes object, checking that it holds
+    exactly one key image.
+
+    :rtype: bytes
+    :return: RGB pixel data.
+    """
+    width, height = image_format['size']
+
+    try:
+        pixels = memoryview(pixels).cast('B').tobytes()
+    except TypeError:
+        pixels = bytes(pixels)
+
+    if len(pixels) != width * height * 3:
+        raise ValueError("Image data should contain {} RGB pixels, got {} bytes.".format(width * height, len(pixels)))
+
+    return pixels
+
+
+def _encode_pil(deck, image_format, pixels):
+    """
+    Encodes a buffer of RGB pixels into a BMP image via a PIL image, which is
+    faster than slicing for key formats that need the pixels transposed.
+
+    :rtype: bytes
+    :return: BMP image data.
+    """
+    from PIL import Image
+    from . import PILHelper
+
+    image = Image.frombuffer("RGB", image_format['size'], _pixel_bytes(image_format, pixels), "raw", "RGB", 0, 1)
+
+    return bytes(PILHelper.to_native_format(deck, image))
+
+
+def _encode_buffer(image_format, transform, pixels):
+    """
+    Encodes a buffer of RGB pixels into a BMP image, transforming the pixels
+    by slicing alone.
+
+    :rtype: bytes
+    :return: BMP image data.
+    """
+    width, height = image_format['size']
+
+    pixels = _pixel_bytes(image_format, pixels)
+
+    if transform[0]:
+        # Transposing moves single pixels, so is done on each color plane
+        # separately before interleaving them back into BGR pixels.
+        data = bytearray(width * height * 3)
+        for channel in range(3):
+            plane, transformed_width, transformed_height = _transform_lines(pixels[2 - channel::3], width, height, 1, transform)
+            data[channel::3] = plane
+
+        width, height = transformed_width, transformed_height
+    else:
+        data, width, height = _transform_lines(pixels, width, height, 3, transform)
+
+        # Reversing the bytes of each row also swaps each pixel from RGB to
+        # BGR; otherwise, swap the red and blue channels explicitly.
+        if not transform[2]:
+            data = bytearray(data)
+            data[0::3], data[2::3] = data[2::3], data[0::3]
+
+    row_length = width * 3
+    row_padding = -row_length % 4
+    if row_padding:
+        data = b''.join(data[r * row_length:(r + 1) * row_length] + bytes(row_padding) for r in range(height))
+
+    return _bmp_header(width, height) + bytes(data)
+
+
+def to_native_format(deck, pixels):
+    """
+    Converts raw RGB pixel data directly to the native BMP image format of a
+    StreamDeck, suitable for passing to :func:`~StreamDeck.set_key_image`.
+    This avoids creating and encoding PIL images, with the key image rotation
+    and mirroring done by rearranging the pixel data. Pixel buffers other than
+    NumPy arrays that need transposing (for the StreamDeck Mini) are still
+    converted via PIL where it is installed, as this is faster.
+
+    This is only supported for StreamDeck models using BMP key images (the
+    StreamDeck Original and StreamDeck Mini).
+
+    .. seealso:: See :func:`~PILHelper.to_native_format` method for converting
+                 PIL images, for any StreamDeck model.
+
+    :param StreamDeck deck: StreamDeck device to generate a compatible native image for.
+    :param enumerable pixels: RGB pixel data of an image with the dimensions of
+                              the deck's keys, stored row by row from the top
+                              left. This may be a NumPy array of shape
+                              `(height, width, 3)`, any other object supporting
+                              the buffer protocol, or an enumerable of bytes.
+
+    :rtype: bytes
+    :return: Image converted to the given StreamDeck's native format
+    """
+    image_format = deck.key_image_format()
+
+    if image_format['format'] != "BMP":
+        raise ValueError("StreamDeck model \"{}\" does not use BMP key images.".format(deck.deck_type()))
+
+    transform = _plane_transform(image_format['rotation'], image_format['flip'])
+
+    if type(pixels).__module__ == "numpy":
+        return _encode_numpy(image_format, transform, pixels)
+
+    if transform[0]:
+        try:
+            return _encode_pil(deck, image_format, pixels)
+        except ImportError:
+            pass
+
+    return _encode_buffer(image_format, transform, pixels)
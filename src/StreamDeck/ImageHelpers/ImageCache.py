@@ -0,0 +1,554 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import collections
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from . import PILHelper
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def _model_key(deck):
+    """
+    Retrieves the part of a cache key identifying the native image format of a
+    StreamDeck, shared by all decks of the same model.
+
+    :param StreamDeck deck: StreamDeck device to identify.
+
+    :rtype: tuple
+    :return: Key identifying the deck's native image format.
+    """
+    image_format, _ = PILHelper._native_format(deck)
+
+    return (image_format['size'], image_format['format'], tuple(image_format['flip']), image_format['rotation'])
+
+
+class NativeImageCache:
+    """
+    Cache of key images already converted to the native image format of a
+    StreamDeck, so that images shown repeatedly (such as the icon and label of
+    a key in its pressed and released states) are only rendered and encoded
+    once.
+
+    Cached images are keyed by the model of StreamDeck they were converted for
+    and a caller supplied key, which should identify the source image and any
+    parameters used to render it. When the cache grows past its byte budget,
+    the least recently used images are discarded.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """
+        Creates a new native image cache.
+
+        :param int max_bytes: Maximum total size of the cached native images,
+                              in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        self.hit_count = 0
+        self.miss_count = 0
+        self.images = collections.OrderedDict()
+
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def image_key(image):
+        """
+        Creates a cache key from the content of a PIL image, for images that
+        have no other identity (such as images drawn at run-time).
+
+        :param PIL.Image image: PIL Image to identify.
+
+        :rtype: tuple
+        :return: Key identifying the image's mode, size and pixel data.
+        """
+        return (image.mode, image.size, hashlib.blake2b(image.tobytes(), digest_size=16).digest())
+
+    def get(self, deck, key):
+        """
+        Retrieves a cached native image.
+
+        :param StreamDeck deck: StreamDeck device the image was converted for.
+        :param hashable key: Key identifying the source image and its render
+                             parameters.
+
+        :rtype: bytes
+        :return: Cached native image, or `None` if no image is cached for the
+                 given key.
+        """
+        cache_key = (_model_key(deck), key)
+
+        with self.lock:
+            native_image = self.images.get(cache_key)
+
+            if native_image is None:
+                self.miss_count += 1
+            else:
+                self.hit_count += 1
+                self.images.move_to_end(cache_key)
+
+            return native_image
+
+    def put(self, deck, key, native_image):
+        """
+        Adds a native image to the cache, discarding the least recently used
+        images if needed to stay within the cache's byte budget. Images larger
+        than the whole budget are not cached.
+
+        :param StreamDeck deck: StreamDeck device the image was converted for.
+        :param hashable key: Key identifying the source image and its render
+                             parameters.
+        :param enumerable native_image: Image in the deck's native format.
+
+        :rtype: bytes
+        :return: The native image, as stored in the cache.
+        """
+        cache_key = (_model_key(deck), key)
+        native_image = bytes(native_image)
+
+        with self.lock:
+            old_image = self.images.pop(cache_key, None)
+            if old_image is not None:
+                self.cached_bytes -= len(old_image)
+
+            if len(native_image) > self.max_bytes:
+                return native_image
+
+            while self.images and self.cached_bytes + len(native_image) > self.max_bytes:
+                _, evicted_image = self.images.popitem(last=False)
+                self.cached_bytes -= len(evicted_image)
+
+            self.images[cache_key] = native_image
+            self.cached_bytes += len(native_image)
+
+        return native_image
+
+    def get_or_create(self, deck, key, create):
+        """
+        Retrieves a cached native image, creating and caching it first if it
+        is not already cached.
+
+        :param StreamDeck deck: StreamDeck device the image is for.
+        :param hashable key: Key identifying the source image and its render
+                             parameters.
+        :param function create: Function returning the image in the deck's
+                                native format, called if no image is cached.
+
+        :rtype: bytes
+        :return: Native image.
+        """
+        native_image = self.get(deck, key)
+
+        if native_image is None:
+            native_image = self.put(deck, key, create())
+
+        return native_image
+
+    def to_native_format(self, deck, image, key=None):
+        """
+        Converts a given PIL image to the native image format for a StreamDeck,
+        as per :func:`~PILHelper.to_native_format`, reusing a previously cached
+        conversion if one exists.
+
+        :param StreamDeck deck: StreamDeck device to generate a compatible native image for.
+        :param PIL.Image image: PIL Image to convert to the native StreamDeck image format
+        :param hashable key: Key identifying the image, `None` to identify it by
+                             its content (see :func:`~NativeImageCache.image_key`).
+
+        :rtype: bytes
+        :return: Image converted to the given StreamDeck's native format
+        """
+        if key is None:
+            key = self.image_key(image)
+
+        return self.get_or_create(deck, key, lambda: PILHelper.to_native_format(deck, image))
+
+    def clear(self):
+        """
+        Discards all cached images, and resets the cache statistics.
+        """
+        with self.lock:
+            self.images.clear()
+            self.cached_bytes = 0
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def size(self):
+        """
+        Retrieves the total size of the cached native images.
+
+        :rtype: int
+        :return: Size of the cached images, in bytes.
+        """
+        return self.cached_bytes
+
+    def hit_rate(self):
+        """
+        Retrieves the fraction of cache lookups that found a cached image.
+
+        :rtype: float
+        :return: Cache hit rate, from [0.0-1.0].
+        """
+        lookups = self.hit_count + self.miss_count
+
+        return self.hit_count / lookups if lookups else 0.0
+
+
+class NativeFrameCache:
+    """
+    Persistent cache of key images and animation frames converted to the
+    native image format of a StreamDeck, so that the conversion work done for
+    each source asset survives application restarts.
+
+    The cache is stored as a single file of entries, each holding all the
+    frames converted from one source asset for one model of StreamDeck. The
+    file is memory-mapped when loaded, and cached frames are returned as views
+    into the mapping, so that they are used without being read or copied up
+    front.
+
+    Cached entries are keyed by the model of StreamDeck they were converted for
+    and a caller supplied key, which should identify the content of the source
+    asset and any parameters used to render it. As keys are stored as a digest
+    of their `repr()`, they should be built only from strings, bytes, numbers
+    and tuples, whose representation is the same in every process.
+
+    The cache file can be shared by several processes: new entries are only
+    ever appended to it under an exclusive file lock, and the file is never
+    shrunk while it may be mapped, being replaced by a new file instead. On
+    platforms without `fcntl` (such as Windows) no file lock is taken, and the
+    cache file should not be written by more than one process at a time.
+    """
+
+    FILE_MAGIC = b'SDFRAMES'
+    FILE_VERSION = 1
+
+    _FILE_HEADER = struct.Struct('<8sII')
+    _ENTRY_HEADER = struct.Struct('<16sIQ')
+    _FRAME_HEADER = struct.Struct('<Qd')
+
+    def __init__(self, path):
+        """
+        Opens a native frame cache, creating the cache file if it does not
+        already exist.
+
+        :param str path: Path of the cache file.
+        """
+        self.path = path
+        self.map = None
+        self.index = dict()
+
+        self.lock = threading.Lock()
+
+        if not os.path.exists(path):
+            # Another process may be creating the same cache file, so the new
+            # file is only linked into place if none exists by then.
+            self._write_file([self._file_header()], replace=False)
+
+        self._load()
+
+    def _file_header(self):
+        """
+        Creates the header of an empty cache file.
+
+        :rtype: bytes
+        :return: Cache file header.
+        """
+        return self._FILE_HEADER.pack(self.FILE_MAGIC, self.FILE_VERSION, 0)
+
+    def _write_file(self, chunks, replace=True):
+        """
+        Writes a new cache file alongside the existing one and moves it into
+        place, so that processes which have the existing file mapped keep
+        their (unmodified) mapping of it.
+
+        :param list(enumerable) chunks: Content of the new cache file.
+        :param bool replace: If `True` the new file replaces any existing
+                             cache file, otherwise it is only moved into place
+                             if no cache file exists.
+        """
+        directory, filename = os.path.split(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=filename + '.')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.writelines(chunks)
+
+            if replace:
+                os.replace(temp_path, self.path)
+            else:
+                try:
+                    os.link(temp_path, self.path)
+                except FileExistsError:
+                    pass
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    @contextlib.contextmanager
+    def _open_locked(self, exclusive):
+        """
+        Opens the cache file and locks it against writes (or, if exclusive,
+        all access) from other processes. If the file is replaced while
+        waiting for the lock, the new file is opened and locked instead.
+
+        :param bool exclusive: If `True` the file is opened for writing and
+                               locked exclusively, otherwise it is opened for
+                               reading and the lock is shared.
+
+        :rtype: file
+        :return: Locked cache file, unlocked when the context is exited.
+        """
+        while True:
+            with open(self.path, 'r+b' if exclusive else 'rb') as f:
+                if fcntl is None:
+                    yield f
+                    return
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+                try:
+                    if os.path.exists(self.path) and os.path.samestat(os.fstat(f.fileno()), os.stat(self.path)):
+                        yield f
+                        return
+                finally:
+                    # Mappings of the file share its lock, so it must be
+                    # released explicitly rather than by closing the file.
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _map_file(self, f):
+        """
+        Memory-maps a locked cache file and indexes its entries, by stepping
+        from each entry's header to the next. Entries written later replace
+        any earlier entries with the same key, and a partially written final
+        entry is ignored.
+
+        :param file f: Cache file, as opened by :func:`~NativeFrameCache._open_locked`.
+
+        :rtype: (mmap.mmap, dict(), int)
+        :return: Mapping of the file, index of its entries, and the length of
+                 its complete entries.
+        """
+        file_length = os.fstat(f.fileno()).st_size
+        file_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_length else None
+
+        if file_length < self._FILE_HEADER.size or self._FILE_HEADER.unpack_from(file_map)[:2] != (self.FILE_MAGIC, self.FILE_VERSION):
+            raise ValueError("File \"{}\" is not a supported native frame cache.".format(self.path))
+
+        index = dict()
+        offset = self._FILE_HEADER.size
+
+        while offset + self._ENTRY_HEADER.size <= file_length:
+            digest, frame_count, data_length = self._ENTRY_HEADER.unpack_from(file_map, offset)
+
+            entry_end = offset + self._ENTRY_HEADER.size + data_length
+            if entry_end > file_length:
+                break
+
+            index[digest] = (offset + self._ENTRY_HEADER.size, frame_count)
+            offset = entry_end
+
+        return file_map, index, offset
+
+    def _load(self):
+        """
+        Memory-maps the cache file and indexes its entries.
+        """
+        with self._open_locked(exclusive=False) as f:
+            file_map, index, _ = self._map_file(f)
+
+        # Existing frame views keep the previous mapping alive until they are
+        # released, so it is dropped rather than closed.
+        self.map = file_map
+        self.index = index
+
+    @staticmethod
+    def content_key(filename):
+        """
+        Creates a cache key from the content of a file, so that cached entries
+        for an asset are not reused if the asset is modified.
+
+        :param str filename: Path of the file to identify.
+
+        :rtype: str
+        :return: Digest of the file's content.
+        """
+        with open(filename, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _entry_digest(deck, key):
+        """
+        Computes the digest used to index a cache entry.
+
+        :param StreamDeck deck: StreamDeck device the frames were converted for.
+        :param hashable key: Key identifying the source asset and its render
+                             parameters.
+
+        :rtype: bytes
+        :return: Digest of the model and caller supplied keys.
+        """
+        return hashlib.blake2b(repr((_model_key(deck), key)).encode('utf-8'), digest_size=16).digest()
+
+    def get(self, deck, key):
+        """
+        Retrieves the cached frames of a source asset.
+
+        :param StreamDeck deck: StreamDeck device the frames were converted for.
+        :param hashable key: Key identifying the source asset and its render
+                             parameters.
+
+        :rtype: list((memoryview, float))
+        :return: List of frames, each a pair of a read-only view of the frame
+                 image in the deck's native format and its display duration
+                 in seconds, or `None` if no frames are cached for the given
+                 key.
+        """
+        digest = self._entry_digest(deck, key)
+
+        with self.lock:
+            entry = self.index.get(digest)
+            if entry is None:
+                return None
+
+            offset, frame_count = entry
+            frame_map = memoryview(self.map)
+
+        frame_headers = [self._FRAME_HEADER.unpack_from(frame_map, offset + i * self._FRAME_HEADER.size) for i in range(frame_count)]
+
+        frames = []
+        frame_offset = offset + frame_count * self._FRAME_HEADER.size
+        for frame_length, duration in frame_headers:
+            frames.append((frame_map[frame_offset:frame_offset + frame_length], duration))
+            frame_offset += frame_length
+
+        return frames
+
+    def put(self, deck, key, frames):
+        """
+        Adds the frames of a source asset to the cache, appending them to the
+        cache file.
+
+        :param StreamDeck deck: StreamDeck device the frames were converted for.
+        :param hashable key: Key identifying the source asset and its render
+                             parameters.
+        :param list((enumerable, float)) frames: List of frames, each a pair of
+                                                 the frame image in the deck's
+                                                 native format and its display
+                                                 duration in seconds.
+
+        :rtype: list((memoryview, float))
+        :return: List of the cached frames, as per :func:`~NativeFrameCache.get`.
+        """
+        digest = self._entry_digest(deck, key)
+        frames = [(bytes(image), float(duration)) for image, duration in frames]
+
+        frame_headers = b''.join(self._FRAME_HEADER.pack(len(image), duration) for image, duration in frames)
+        data_length = len(frame_headers) + sum(len(image) for image, _ in frames)
+
+        entry = [self._ENTRY_HEADER.pack(digest, len(frames), data_length), frame_headers]
+        entry.extend(image for image, _ in frames)
+
+        with self.lock:
+            with self._open_locked(exclusive=True) as f:
+                # Validate the file as it is now, as other processes may have
+                # appended to it since it was loaded.
+                file_map, _, valid_length = self._map_file(f)
+
+                if valid_length == len(file_map):
+                    f.seek(valid_length)
+                    f.writelines(entry)
+                    f.flush()
+                else:
+                    # A partially written entry was left at the end of the
+                    # file; rather than truncating a file that may be mapped,
+                    # the complete entries are copied into a new file.
+                    self._write_file([file_map[:valid_length]] + entry)
+
+                file_map.close()
+
+            self._load()
+
+        return self.get(deck, key)
+
+    def get_or_create(self, deck, key, create):
+        """
+        Retrieves the cached frames of a source asset, creating and caching
+        them first if they are not already cached.
+
+        :param StreamDeck deck: StreamDeck device the frames are for.
+        :param hashable key: Key identifying the source asset and its render
+                             parameters.
+        :param function create: Function returning the list of frames, as per
+                                :func:`~NativeFrameCache.put`, called if no
+                                frames are cached.
+
+        :rtype: list((memoryview, float))
+        :return: List of frames, as per :func:`~NativeFrameCache.get`.
+        """
+        frames = self.get(deck, key)
+
+        if frames is None:
+            frames = self.put(deck, key, create())
+
+        return frames
+
+    def to_native_animation(self, deck, filename, margins=[0, 0, 0, 0], background='black', workers=1):
+        """
+        Loads an image file (such as an animated GIF) and converts each of its
+        frames to the native image format for a StreamDeck, as per
+        :func:`~PILHelper.to_native_animation`, reusing a previously cached
+        conversion of the same file content if one exists.
+
+        :param StreamDeck deck: StreamDeck device to generate compatible native images for.
+        :param str filename: Path of the image file to convert.
+        :param list(int): Array of margin pixels in (top, right, bottom, left) order.
+        :param str background: Background color to use, compatible with `PIL.Image.new()`.
+        :param int workers: Number of worker processes used to convert the frames,
+                            as per :func:`~PILHelper.to_native_format_many`.
+
+        :rtype: list((memoryview, float))
+        :return: List of frames, as per :func:`~NativeFrameCache.get`.
+        """
+        from PIL import Image
+
+        def create():
+            with Image.open(filename) as image:
+                return PILHelper.to_native_animation(deck, image, margins=margins, background=background, workers=workers)
+
+        key = ('animation', self.content_key(filename), tuple(margins), background)
+        return self.get_or_create(deck, key, create)
+
+    def clear(self):
+        """
+        Discards all cached frames, replacing the cache file with an empty
+        one. Frames already retrieved from the cache remain valid, as they
+        keep the previous cache file mapped until they are released.
+        """
+        with self.lock:
+            with self._open_locked(exclusive=True):
+                self._write_file([self._file_header()])
+
+            self._load()
+
+    def close(self):
+        """
+        Closes the cache, releasing its mapping of the cache file once all
+        frames retrieved from it are no longer in use.
+        """
+        with self.lock:
+            self.map = None
+            self.index = dict()
@@ -5,7 +5,102 @@
 #         www.fourwalledcubicle.com
 #
 
+import concurrent.futures
+import functools
 import io
+import math
+import os
+
+from . import BMPHelper
+
+
+# Cached native image formats of each StreamDeck key format, see `_native_format()`.
+_NATIVE_FORMATS = dict()
+
+# Marker for image formats whose rotation cannot be expressed as a transpose.
+_TRANSFORM_SLOW_PATH = object()
+
+
+def _transpose_method(image_format):
+    """
+    Determines the single PIL transpose operation equivalent to the rotation
+    and mirroring of the given StreamDeck image format, by applying them to a
+    small test pattern.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+
+    :rtype: int
+    :return: PIL transpose method to apply, `None` if no transformation is
+             needed, or `_TRANSFORM_SLOW_PATH` if the rotation is not a
+             multiple of 90 degrees.
+    """
+    from PIL import Image
+
+    if (image_format['rotation'] or 0) % 90:
+        return _TRANSFORM_SLOW_PATH
+
+    pattern = Image.frombytes("L", (3, 3), bytes(range(9)))
+    transformed = _transform_image(image_format, pattern).tobytes()
+
+    if transformed == pattern.tobytes():
+        return None
+
+    methods = [
+        Image.FLIP_LEFT_RIGHT, Image.FLIP_TOP_BOTTOM, Image.ROTATE_90,
+        Image.ROTATE_180, Image.ROTATE_270, Image.TRANSPOSE, Image.TRANSVERSE,
+    ]
+
+    return next(m for m in methods if pattern.transpose(m).tobytes() == transformed)
+
+
+def _transform_image(image_format, image):
+    """
+    Rotates and mirrors an image as required by the given StreamDeck image
+    format, one operation at a time.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param PIL.Image image: PIL Image to transform.
+
+    :rtype: PIL.Image
+    :return: Transformed PIL image.
+    """
+    from PIL import Image
+
+    if image_format['rotation']:
+        image = image.rotate(image_format['rotation'])
+
+    if image_format['flip'][0]:
+        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+
+    if image_format['flip'][1]:
+        image = image.transpose(Image.FLIP_TOP_BOTTOM)
+
+    return image
+
+
+def _native_format(deck):
+    """
+    Retrieves the native image format of a StreamDeck, along with the single
+    transpose operation needed to convert images to it. This is computed once
+    for each distinct key format, so that decks of the same model (and objects
+    wrapping a deck, such as an :class:`AsyncStreamDeck`) share the result.
+
+    :param StreamDeck deck: StreamDeck device to retrieve the format of.
+
+    :rtype: (dict(), int)
+    :return: Image format as per :func:`~StreamDeck.key_image_format`, and
+             transpose method as per `_transpose_method()`.
+    """
+    format_key = (deck.KEY_PIXEL_WIDTH, deck.KEY_PIXEL_HEIGHT, deck.KEY_FLIP, deck.KEY_ROTATION, deck.KEY_IMAGE_FORMAT)
+
+    native_format = _NATIVE_FORMATS.get(format_key)
+    if native_format is None:
+        image_format = deck.key_image_format()
+        native_format = (image_format, _transpose_method(image_format))
+
+        _NATIVE_FORMATS[format_key] = native_format
+
+    return native_format
 
 
 def create_image(deck, background='black'):
@@ -51,12 +146,28 @@ def create_scaled_image(deck, image, margins=[0, 0, 0, 0], background='black'):
     :rtrype: PIL.Image
     :return: Loaded PIL image scaled and centered
     """
-    from PIL import Image
-
     if len(margins) != 4:
         raise ValueError("Margins should be given as an array of four integers.")
 
-    final_image = create_image(deck, background=background)
+    return _scale_image(deck.key_image_format(), image, margins, background)
+
+
+def _scale_image(image_format, image, margins, background):
+    """
+    Creates a new key image that contains a scaled version of a given image,
+    as per :func:`~PILHelper.create_scaled_image`.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param Image image: PIL Image object to scale
+    :param list(int): Array of margin pixels in (top, right, bottom, left) order.
+    :param str background: Background color to use, compatible with `PIL.Image.new()`.
+
+    :rtype: PIL.Image
+    :return: Loaded PIL image scaled and centered
+    """
+    from PIL import Image
+
+    final_image = Image.new("RGB", image_format['size'], background)
 
     thumbnail_max_width = final_image.width - (margins[1] + margins[3])
     thumbnail_max_height = final_image.height - (margins[0] + margins[2])
@@ -86,23 +197,353 @@ def to_native_format(deck, image):
     :rtype: enumerable()
     :return: Image converted to the given StreamDeck's native format
     """
-    from PIL import Image
+    image_format, transpose_method = _native_format(deck)
 
-    image_format = deck.key_image_format()
+    return _convert_image(image_format, transpose_method, image)
 
-    if image_format['rotation']:
-        image = image.rotate(image_format['rotation'])
 
-    if image_format['flip'][0]:
-        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+def _convert_image(image_format, transpose_method, image):
+    """
+    Converts a given PIL image to the native image format for a StreamDeck.
 
-    if image_format['flip'][1]:
-        image = image.transpose(Image.FLIP_TOP_BOTTOM)
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param int transpose_method: Transpose method, as per `_transpose_method()`.
+    :param PIL.Image image: PIL Image to convert.
+
+    :rtype: enumerable()
+    :return: Image converted to the native format.
+    """
+    # Rotation and mirroring are applied as a single transpose where possible,
+    # so that only one intermediate image is created. A rotation by 90 or 270
+    # degrees crops a non-square image rather than swapping its dimensions as
+    # a transpose would, so such images are transformed one step at a time.
+    rotation_crops = image.width != image.height and (image_format['rotation'] or 0) % 180
+
+    if transpose_method is _TRANSFORM_SLOW_PATH or rotation_crops:
+        image = _transform_image(image_format, image)
+    elif transpose_method is not None:
+        image = image.transpose(transpose_method)
 
     if image.size != image_format['size']:
         image.thumbnail(image_format['size'])
 
+    return _encode_image(image_format, image)
+
+
+def _convert_image_chunk(image_format, images):
+    """
+    Converts a chunk of PIL images to the native image format for a
+    StreamDeck. This is run in the worker processes of
+    :func:`~PILHelper.to_native_format_many`.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param list(PIL.Image) images: PIL Images to convert.
+
+    :rtype: list(bytes)
+    :return: Images converted to the native format.
+    """
+    transpose_method = _transpose_method(image_format)
+
+    return [bytes(_convert_image(image_format, transpose_method, image)) for image in images]
+
+
+def _convert_frame_chunk(image_format, margins, background, frames):
+    """
+    Scales and converts a chunk of animation frames to the native image format
+    for a StreamDeck. This is run in the worker processes of
+    :func:`~PILHelper.to_native_animation`, so that both the scaling and the
+    encoding of each frame are done in parallel.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param list(int): Array of margin pixels in (top, right, bottom, left) order.
+    :param str background: Background color to use, compatible with `PIL.Image.new()`.
+    :param list(PIL.Image) frames: Unscaled animation frames to convert.
+
+    :rtype: list(bytes)
+    :return: Frames converted to the native format.
+    """
+    transpose_method = _transpose_method(image_format)
+
+    return [bytes(_convert_image(image_format, transpose_method, _scale_image(image_format, frame, margins, background))) for frame in frames]
+
+
+def _map_chunks(function, items, workers, chunk_size):
+    """
+    Applies a function to chunks of the given items, spreading the chunks
+    across a pool of worker processes.
+
+    :param function function: Function taking a list of items and returning a
+                              list of results; must be picklable.
+    :param list items: Items to process.
+    :param int workers: Number of worker processes to use, `None` to use one
+                        per CPU core. With a single worker, all items are
+                        processed on the calling thread.
+    :param int chunk_size: Number of items sent to a worker at a time, `None`
+                           to split the items into about four chunks per
+                           worker.
+
+    :rtype: list
+    :return: Results for each item, in the same order as the given items.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return function(items)
+
+    chunk_size = chunk_size or math.ceil(len(items) / (workers * 4))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for chunk in executor.map(function, chunks) for result in chunk]
+
+
+def to_native_format_many(deck, images, workers=None, chunk_size=None):
+    """
+    Converts many PIL images to the native image format for a StreamDeck,
+    spreading the work across a pool of worker processes. This is useful for
+    pre-rendering large numbers of images, such as the frames of animations,
+    as image encoding is CPU-bound and does not run in parallel on threads.
+
+    .. note:: As this starts new Python processes, scripts calling this must
+              guard their main code with `if __name__ == "__main__":`.
+
+    .. seealso:: See :func:`~PILHelper.to_native_format` method for converting
+                 a single image.
+
+    :param StreamDeck deck: StreamDeck device to generate compatible native images for.
+    :param enumerable(PIL.Image) images: PIL Images to convert.
+    :param int workers: Number of worker processes to use, `None` to use one
+                        per CPU core. With a single worker, images are
+                        converted on the calling thread.
+    :param int chunk_size: Number of images sent to a worker at a time, `None`
+                           to split the images into about four chunks per
+                           worker.
+
+    :rtype: list(bytes)
+    :return: List of images converted to the given StreamDeck's native format,
+             in the same order as the given images.
+    """
+    image_format, _ = _native_format(deck)
+
+    return _map_chunks(functools.partial(_convert_image_chunk, image_format), list(images), workers, chunk_size)
+
+
+def _encode_image(image_format, image):
+    """
+    Encodes a (rotated and mirrored) PIL image in the native image codec of a
+    StreamDeck.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param PIL.Image image: PIL Image to encode.
+
+    :rtype: enumerable()
+    :return: Encoded image data.
+    """
     # We want a compressed image in a given codec, convert.
     compressed_image = io.BytesIO()
     image.save(compressed_image, image_format['format'], quality=100)
     return compressed_image.getbuffer()
+
+
+def _check_array(image_format, array, dimensions):
+    """
+    Checks that a NumPy array holds RGB pixel data with the dimensions of a
+    StreamDeck's keys, as 8-bit values.
+
+    :param dict() image_format: Image format, as per :func:`~StreamDeck.key_image_format`.
+    :param numpy.ndarray array: Array of a single frame, or a stack of frames.
+    :param int dimensions: Expected number of array dimensions; 3 for a single
+                           frame, or 4 for a stack of frames.
+    """
+    width, height = image_format['size']
+
+    if array.ndim != dimensions or array.shape[-3:] != (height, width, 3):
+        expected_shape = "({}{}, {}, 3)".format("count, " if dimensions == 4 else "", height, width)
+        raise ValueError("Image array should have shape {}, got {}.".format(expected_shape, array.shape))
+
+    if array.dtype.name != 'uint8':
+        raise ValueError("Image array should contain uint8 values, got {}.".format(array.dtype))
+
+
+def _transpose_array(frames, transpose_method):
+    """
+    Applies a PIL transpose operation to a stack of NumPy image frames at
+    once, returning a view of the frames without copying any pixel data.
+
+    :param numpy.ndarray frames: Array of frames, of shape `(N, H, W, 3)`.
+    :param int transpose_method: PIL transpose method to apply, or `None`.
+
+    :rtype: numpy.ndarray
+    :return: View of the transformed frames.
+    """
+    from PIL import Image
+
+    if transpose_method is None:
+        return frames
+
+    transposed = frames.transpose(0, 2, 1, 3)
+
+    return {
+        Image.FLIP_LEFT_RIGHT: lambda: frames[:, :, ::-1],
+        Image.FLIP_TOP_BOTTOM: lambda: frames[:, ::-1],
+        Image.ROTATE_90: lambda: transposed[:, ::-1],
+        Image.ROTATE_180: lambda: frames[:, ::-1, ::-1],
+        Image.ROTATE_270: lambda: transposed[:, :, ::-1],
+        Image.TRANSPOSE: lambda: transposed,
+        Image.TRANSVERSE: lambda: transposed[:, ::-1, ::-1],
+    }[transpose_method]()
+
+
+def to_native_format_array(deck, pixels):
+    """
+    Converts raw RGB pixel data, such as a NumPy array, to the native image
+    format for a StreamDeck, suitable for passing to
+    :func:`~StreamDeck.set_key_image`. For StreamDeck models using BMP key
+    images, NumPy arrays (and for the StreamDeck Original, any pixel data) are
+    encoded directly without an intermediate PIL image.
+
+    .. seealso:: See :func:`~PILHelper.to_native_format_array_batch` method
+                 for converting many images at once.
+
+    :param StreamDeck deck: StreamDeck device to generate a compatible native image for.
+    :param enumerable pixels: RGB pixel data of an image with the dimensions of
+                              the deck's keys, stored row by row from the top
+                              left. This may be a NumPy array of shape
+                              `(height, width, 3)`, any other object supporting
+                              the buffer protocol, or an enumerable of bytes.
+
+    :rtype: enumerable()
+    :return: Image converted to the given StreamDeck's native format
+    """
+    if type(pixels).__module__ == "numpy":
+        image_format, _ = _native_format(deck)
+
+        _check_array(image_format, pixels, 3)
+        pixels = pixels.reshape((1,) + pixels.shape)
+    else:
+        pixels = [pixels]
+
+    return to_native_format_array_batch(deck, pixels)[0]
+
+
+def to_native_format_array_batch(deck, frames):
+    """
+    Converts a batch of raw RGB images to the native image format for a
+    StreamDeck. When given as a single NumPy array, the rotation and mirroring
+    of all frames is done at once, before each frame is encoded.
+
+    .. seealso:: See :func:`~PILHelper.to_native_format_array` method for
+                 details on the accepted pixel data.
+
+    :param StreamDeck deck: StreamDeck device to generate compatible native images for.
+    :param enumerable frames: NumPy array of frames of shape
+                              `(count, height, width, 3)`, or an enumerable of
+                              frames each accepted by
+                              :func:`~PILHelper.to_native_format_array`.
+
+    :rtype: list(enumerable())
+    :return: List of images converted to the given StreamDeck's native format,
+             in the same order as the given frames.
+    """
+    from PIL import Image
+
+    image_format, transpose_method = _native_format(deck)
+
+    if type(frames).__module__ == "numpy":
+        _check_array(image_format, frames, 4)
+    else:
+        frames = list(frames)
+
+        for frame in frames:
+            if type(frame).__module__ == "numpy":
+                _check_array(image_format, frame, 3)
+
+    # The direct BMP encoder is only faster than PIL for NumPy arrays, or for
+    # key formats that need no transpose (such as the StreamDeck Original);
+    # other pixel buffers are converted through PIL below.
+    direct_bmp = image_format['format'] == "BMP"
+    if direct_bmp:
+        transform = BMPHelper._plane_transform(image_format['rotation'], image_format['flip'])
+
+        if type(frames).__module__ == "numpy" or not transform[0]:
+            return [BMPHelper.to_native_format(deck, frame) for frame in frames]
+
+    if type(frames).__module__ == "numpy" and transpose_method is not _TRANSFORM_SLOW_PATH:
+        frames = _transpose_array(frames, transpose_method)
+        transpose_method = None
+
+    width, height = image_format['size']
+
+    native_images = []
+    for frame in frames:
+        if direct_bmp and type(frame).__module__ == "numpy":
+            native_images.append(BMPHelper.to_native_format(deck, frame))
+            continue
+
+        if type(frame).__module__ == "numpy":
+            import numpy
+
+            image = Image.fromarray(numpy.ascontiguousarray(frame, dtype=numpy.uint8), "RGB")
+        else:
+            try:
+                frame = memoryview(frame).cast('B')
+            except TypeError:
+                frame = bytes(frame)
+
+            if len(frame) != width * height * 3:
+                raise ValueError("Image data should contain {} RGB pixels, got {} bytes.".format(width * height, len(frame)))
+
+            image = Image.frombuffer("RGB", (width, height), frame, "raw", "RGB", 0, 1)
+
+        if transpose_method is _TRANSFORM_SLOW_PATH:
+            image = _transform_image(image_format, image)
+        elif transpose_method is not None:
+            image = image.transpose(transpose_method)
+
+        native_images.append(_encode_image(image_format, image))
+
+    return native_images
+
+
+def to_native_animation(deck, image, margins=[0, 0, 0, 0], background='black', workers=1):
+    """
+    Converts each frame of a given (possibly animated) PIL image to the native
+    image format for a StreamDeck, scaled to fit the deck's keys. The display
+    duration of each frame is taken from the image's metadata, so that the
+    result can be passed directly to :func:`~Animator.set_key_animation`.
+
+    .. seealso:: See :func:`~PILHelper.create_scaled_image` method for details
+                 on how each frame is scaled.
+
+    :param StreamDeck deck: StreamDeck device to generate compatible native images for.
+    :param PIL.Image image: PIL Image (such as an animated GIF) to convert.
+    :param list(int): Array of margin pixels in (top, right, bottom, left) order.
+    :param str background: Background color to use, compatible with `PIL.Image.new()`.
+    :param int workers: Number of worker processes used to scale and convert
+                        the frames, as per :func:`~PILHelper.to_native_format_many`.
+
+    :rtype: list((bytes, float))
+    :return: List of frames, each a pair of the frame image converted to the
+             given StreamDeck's native format and its display duration in
+             seconds.
+    """
+    from PIL import ImageSequence
+
+    if len(margins) != 4:
+        raise ValueError("Margins should be given as an array of four integers.")
+
+    image_format, _ = _native_format(deck)
+
+    frames = []
+    durations = []
+
+    for frame in ImageSequence.Iterator(image):
+        # Frames without a valid duration are shown for 100ms, matching the
+        # behavior of most GIF viewers.
+        durations.append((frame.info.get('duration') or 100) / 1000)
+
+        # Frames are only decoded here; scaling them is left to the workers.
+        frames.append(frame.copy())
+
+    native_frames = _map_chunks(functools.partial(_convert_frame_chunk, image_format, margins, background), frames, workers, None)
+
+    return list(zip(native_frames, durations))
@@ -0,0 +1,191 @@
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+import threading
+
+from .Transport.Transport import TransportError
+
+
+class SharedReader:
+    """
+    Shared key event reader, servicing any number of StreamDeck devices from a
+    single thread. Each deck added to the reader stops using its own internal
+    reader thread; instead, the shared reader reads all key reports pending on
+    every deck in turn, and fires off each deck's registered key callback from
+    the shared thread.
+
+    When no deck has a report pending, the reader waits within the transport
+    for the next report of one of the decks (taking turns between decks), up
+    to the poll interval, before checking all decks again.
+
+    This keeps the number of threads (and the per-thread wakeups) constant no
+    matter how many decks are attached to the host.
+    """
+
+    def __init__(self, poll_hz=100):
+        """
+        Creates a new shared key event reader.
+
+        :param int poll_hz: Frequency at which all decks are checked for new
+                            key states while they are idle, in Hz (1-1000).
+        """
+        self.decks = []
+        self.read_thread = None
+        self.run_read_thread = False
+        self.read_poll_hz = min(max(poll_hz, 1), 1000)
+
+        self.lock = threading.Lock()
+        self.thread_lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def _read_deck(self, deck, timeout=None):
+        """
+        Reads a key report from a deck, firing off its registered callback for
+        any changed key states.
+
+        :param StreamDeck deck: StreamDeck device to read from.
+        :param int timeout: Maximum time to wait for a key report, in
+                            milliseconds, or `None` to return immediately.
+
+        :rtype: bool
+        :return: `True` if a key report was read, `False` otherwise.
+        """
+        if not deck.is_open():
+            return False
+
+        try:
+            new_key_states = deck._read_key_states(timeout)
+        except TransportError:
+            deck.close()
+            return False
+
+        if new_key_states is None:
+            return False
+
+        deck._update_key_states(new_key_states)
+        return True
+
+    def _read(self):
+        """
+        Read handler for the shared reader thread, reading all pending key
+        reports of each deck in turn and firing off their registered callbacks.
+        """
+        wait_index = 0
+
+        while self.run_read_thread:
+            with self.lock:
+                decks = list(self.decks)
+
+            idle = True
+            for deck in decks:
+                while self.run_read_thread and self._read_deck(deck):
+                    idle = False
+
+            if not idle:
+                continue
+
+            # Wait for the next report of one of the decks within its transport,
+            # so that we wake up as soon as it arrives. Other decks are checked
+            # again once the wait times out.
+            wait_deck = decks[wait_index % len(decks)] if decks else None
+            wait_index += 1
+
+            if wait_deck is not None and wait_deck.is_open():
+                self._read_deck(wait_deck, timeout=max(1000 // self.read_poll_hz, 1))
+            else:
+                self.stop_event.wait(1.0 / self.read_poll_hz)
+
+    def _setup_reader(self, enabled):
+        """
+        Starts or stops the shared reader thread.
+
+        :param bool enabled: `True` if the reader thread should be running.
+        """
+        if self.read_thread is not None and not enabled:
+            self.run_read_thread = False
+            self.stop_event.set()
+
+            if self.read_thread is not threading.current_thread():
+                try:
+                    self.read_thread.join()
+                except RuntimeError:
+                    pass
+
+            self.read_thread = None
+
+        if self.read_thread is None and enabled:
+            self.stop_event.clear()
+            self.run_read_thread = True
+            self.read_thread = threading.Thread(target=self._read)
+            self.read_thread.daemon = True
+            self.read_thread.start()
+
+    def add_deck(self, deck):
+        """
+        Adds a StreamDeck to the shared reader. The deck's own reader thread is
+        terminated, and its key events are read by the shared reader from then
+        on, including after it is re-opened.
+
+        :param StreamDeck deck: StreamDeck device to read key events from.
+        """
+        with self.lock:
+            if deck in self.decks:
+                return
+
+            deck.shared_reader = self
+            deck._setup_reader(None)
+
+            self.decks.append(deck)
+
+        with self.thread_lock:
+            self._setup_reader(True)
+
+    def remove_deck(self, deck):
+        """
+        Removes a StreamDeck from the shared reader. If the deck is still open,
+        it resumes reading key events on its own reader thread.
+
+        :param StreamDeck deck: StreamDeck device to stop reading key events from.
+        """
+        with self.lock:
+            if deck not in self.decks:
+                return
+
+            self.decks.remove(deck)
+            deck.shared_reader = None
+
+            if deck.is_open():
+                deck._setup_reader(deck._read)
+
+        # The reader thread must be stopped without holding the deck list lock,
+        # as the thread itself acquires it on each poll.
+        with self.thread_lock:
+            self._setup_reader(len(self.decks) > 0)
+
+    def set_poll_frequency(self, hz):
+        """
+        Sets the frequency at which the shared reader checks all decks for new
+        key states while they are idle.
+
+        A higher frequency will result in a higher CPU usage, but a lower
+        latency between a physical button press and a event from the library.
+
+        :param int hz: Reader thread frequency, in Hz (1-1000).
+        """
+        self.read_poll_hz = min(max(hz, 1), 1000)
+
+    def stop(self):
+        """
+        Removes all decks from the shared reader and terminates its thread.
+        Decks that are still open resume reading key events on their own
+        reader threads.
+        """
+        with self.lock:
+            decks = list(self.decks)
+
+        for deck in decks:
+            self.remove_deck(deck)
@@ -7,6 +7,7 @@
 
 import binascii
 import logging
+import time
 
 from .Transport import Transport, TransportError
 
@@ -17,26 +18,29 @@ class Dummy(Transport):
     """
 
     class Device(Transport.Device):
-        def __init__(self, device_id):
+        def __init__(self, device_id, vendor_id=None, product_id=None, serial_number=None):
             self.id = device_id
-            self.is_open = False
+            self.vid = vendor_id
+            self.pid = product_id
+            self.serial = serial_number
+            self.opened = False
 
         def open(self):
-            if self.is_open:
+            if self.opened:
                 return
 
             logging.info("Deck opened")
-            self.is_open = True
+            self.opened = True
 
         def close(self):
-            if not self.is_open:
+            if not self.opened:
                 return
 
             logging.info("Deck closed")
-            self.is_open = False
+            self.opened = False
 
         def is_open(self):
-            return True
+            return self.opened
 
         def connected(self):
             return True
@@ -44,31 +48,58 @@ class Dummy(Transport):
         def path(self):
             return self.id
 
+        def vendor_id(self):
+            return self.vid
+
+        def product_id(self):
+            return self.pid
+
+        def serial_number(self):
+            return self.serial
+
         def write_feature(self, payload):
-            if not self.is_open:
+            if not self.opened:
                 raise TransportError("Deck feature write while deck not open.")
 
             logging.info("Deck feature write (length %s):\n%s", len(payload), binascii.hexlify(payload, ' ').decode('utf-8'))
             return True
 
         def read_feature(self, report_id, length):
-            if not self.is_open:
+            if not self.opened:
                 raise TransportError("Deck feature read while deck not open.")
 
             logging.info("Deck feature read (length %s)", length)
             return bytearray(length)
 
         def write(self, payload):
-            if not self.is_open:
+            if not self.opened:
                 raise TransportError("Deck write while deck not open.")
 
             logging.info("Deck report write (length %s):\n%s", len(payload), binascii.hexlify(payload, ' ').decode('utf-8'))
             return True
 
-        def read(self, length):
-            if not self.is_open:
+        def write_many(self, payloads):
+            if not self.opened:
+                raise TransportError("Deck write while deck not open.")
+
+            total_length = 0
+            for payload in payloads:
+                logging.info("Deck report write (length %s):\n%s", len(payload), binascii.hexlify(payload, ' ').decode('utf-8'))
+                total_length += len(payload)
+
+            return total_length
+
+        def read(self, length, timeout=None):
+            if not self.opened:
                 raise TransportError("Deck read while deck not open.")
 
+            # A dummy device never has a report pending, so only blocking
+            # reads (after waiting out the timeout) return a report.
+            if timeout is None:
+                return None
+
+            time.sleep(timeout / 1000)
+
             logging.info("Deck report read (length %s)", length)
             return bytearray(length)
 
@@ -77,4 +108,4 @@ class Dummy(Transport):
         pass
 
     def enumerate(self, vid, pid):
-        return [Dummy.Device("{}:{}".format(vid, pid))]
+        return [Dummy.Device("{}:{}".format(vid, pid), vid, pid, "DUMMY-{}-{}".format(vid, pid))]
@@ -21,6 +21,7 @@ class LibUSBHIDAPI(Transport):
 
     class Library():
         HIDAPI_INSTANCE = None
+        HIDAPI_MUTEX = threading.Lock()
 
         def _load_hidapi_library(self, library_search_list):
             """
@@ -97,6 +98,9 @@ class LibUSBHIDAPI(Transport):
             self.HIDAPI_INSTANCE.hid_read.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_char), ctypes.c_size_t]
             self.HIDAPI_INSTANCE.hid_read.restype = ctypes.c_int
 
+            self.HIDAPI_INSTANCE.hid_read_timeout.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_char), ctypes.c_size_t, ctypes.c_int]
+            self.HIDAPI_INSTANCE.hid_read_timeout.restype = ctypes.c_int
+
             self.HIDAPI_INSTANCE.hid_init()
             atexit.register(self.HIDAPI_INSTANCE.hid_exit)
 
@@ -124,7 +128,12 @@ class LibUSBHIDAPI(Transport):
             if not self.hidapi:
                 raise TransportError("No suitable LibUSB HIDAPI library found on this system. Is the '{}' library installed?".format(platform_search_library_names[0]))
 
-            self.mutex = threading.Lock()
+            # HIDAPI is not thread safe for operations that affect the library
+            # as a whole (enumerating, opening and closing devices), so those
+            # are serialized across all library instances. Operations on an
+            # open device handle only need to be serialized per device, which
+            # is handled by the owning Device instance.
+            self.mutex = self.HIDAPI_MUTEX
 
         def enumerate(self, vendor_id=None, product_id=None):
             """
@@ -155,6 +164,10 @@ class LibUSBHIDAPI(Transport):
                             'path': current_device.contents.path.decode('utf-8'),
                             'vendor_id': current_device.contents.vendor_id,
                             'product_id': current_device.contents.product_id,
+                            'serial_number': current_device.contents.serial_number,
+                            'manufacturer_string': current_device.contents.manufacturer_string,
+                            'product_string': current_device.contents.product_string,
+                            'interface_number': current_device.contents.interface_number,
                         })
 
                         current_device = current_device.contents.next
@@ -194,10 +207,45 @@ class LibUSBHIDAPI(Transport):
                 if handle:
                     self.hidapi.hid_close(handle)
 
+        @staticmethod
+        def _report_buffer(data):
+            """
+            Retrieves an object that can be passed to the HIDAPI library as a
+            pointer to the given report data, avoiding a copy of the data where
+            possible.
+
+            :param enumerable() data: Report data, as a `bytes` object, any
+                                      other object supporting the buffer
+                                      protocol, or an enumerable of bytes.
+
+            :rtype: (object, int)
+            :return: Report data to pass to the library, and its length in
+                     bytes.
+            """
+            if isinstance(data, bytes):
+                return data, len(data)
+
+            try:
+                view = memoryview(data)
+            except TypeError:
+                data = bytes(data)
+                return data, len(data)
+
+            if view.readonly or not view.c_contiguous:
+                data = view.tobytes()
+                return data, len(data)
+
+            return (ctypes.c_char * view.nbytes).from_buffer(view), view.nbytes
+
         def send_feature_report(self, handle, data):
             """
             Sends a HID Feature report to an open HID device.
 
+            .. note:: Calls accessing the same device handle must be serialized
+                      by the caller (although a read may run alongside other
+                      calls), and the handle must not be closed while a call
+                      is in progress.
+
             :param Handle handle: Device handle to access.
             :param bytearray() data: Array of bytes to send to the device, as a
                                      feature report. The first byte of the
@@ -207,11 +255,12 @@ class LibUSBHIDAPI(Transport):
             :rtype: int
             :return: Number of bytes successfully sent to the device.
             """
-            with self.mutex:
-                if not handle:
-                    raise TransportError("No HID device.")
+            if not handle:
+                raise TransportError("No HID device.")
+
+            data, length = self._report_buffer(data)
 
-                result = self.hidapi.hid_send_feature_report(handle, bytes(data), len(data))
+            result = self.hidapi.hid_send_feature_report(handle, data, length)
 
             if result < 0:
                 raise TransportError("Failed to write feature report (%d)" % result)
@@ -222,6 +271,11 @@ class LibUSBHIDAPI(Transport):
             """
             Retrieves a HID Feature report from an open HID device.
 
+            .. note:: Calls accessing the same device handle must be serialized
+                      by the caller (although a read may run alongside other
+                      calls), and the handle must not be closed while a call
+                      is in progress.
+
             :param Handle handle: Device handle to access.
             :param int report_id: Report ID of the report being read.
             :param int length: Maximum length of the Feature report to read.
@@ -240,11 +294,10 @@ class LibUSBHIDAPI(Transport):
             data = ctypes.create_string_buffer(read_length)
             data[0] = report_id
 
-            with self.mutex:
-                if not handle:
-                    raise TransportError("No HID device.")
+            if not handle:
+                raise TransportError("No HID device.")
 
-                result = self.hidapi.hid_get_feature_report(handle, data, len(data))
+            result = self.hidapi.hid_get_feature_report(handle, data, len(data))
 
             if result < 0:
                 raise TransportError("Failed to read feature report (%d)" % result)
@@ -261,67 +314,144 @@ class LibUSBHIDAPI(Transport):
             """
             Writes a HID Out report to an open HID device.
 
+            .. note:: Calls accessing the same device handle must be serialized
+                      by the caller (although a read may run alongside other
+                      calls), and the handle must not be closed while a call
+                      is in progress.
+
             :param Handle handle: Device handle to access.
             :param bytearray() data: Array of bytes to send to the device, as an
                                      out report. The first byte of the report
                                      should be the Report ID of the report being
-                                     sent.
+                                     sent. Any object supporting the buffer
+                                     protocol may be given, and writable buffers
+                                     are sent without being copied.
 
             :rtype: int
             :return: Number of bytes successfully sent to the device.
             """
-            with self.mutex:
-                if not handle:
-                    raise TransportError("No HID device.")
+            if not handle:
+                raise TransportError("No HID device.")
+
+            data, length = self._report_buffer(data)
 
-                result = self.hidapi.hid_write(handle, bytes(data), len(data))
+            result = self.hidapi.hid_write(handle, data, length)
 
             if result < 0:
                 raise TransportError("Failed to write out report (%d)" % result)
 
             return result
 
-        def read(self, handle, length):
+        def write_many(self, handle, reports):
             """
-            Performs a non-blocking read of a HID In report from an open HID device.
+            Writes a sequence of HID Out reports to an open HID device, in
+            order. Reports held in writable buffers (such as `bytearray`
+            objects, or views into them) or in `bytes` objects are passed to
+            the HIDAPI library without being copied.
+
+            .. note:: Calls accessing the same device handle must be serialized
+                      by the caller (although a read may run alongside other
+                      calls), and the handle must not be closed while a call
+                      is in progress.
 
             :param Handle handle: Device handle to access.
-            :param int length: Maximum length of the In report to read.
+            :param enumerable() reports: Enumerable list of reports to send to
+                                         the device, each formatted as per
+                                         :func:`~LibUSBHIDAPI.Library.write`.
 
-            :rtype: bytearray()
-            :return: Array of bytes containing the read In report. The
+            :rtype: int
+            :return: Total number of bytes successfully sent to the device.
+            """
+            if not handle:
+                raise TransportError("No HID device.")
+
+            hid_write = self.hidapi.hid_write
+
+            total_length = 0
+            for data in reports:
+                data, length = self._report_buffer(data)
+
+                result = hid_write(handle, data, length)
+
+                if result < 0:
+                    raise TransportError("Failed to write out report (%d)" % result)
+
+                total_length += result
+
+            return total_length
+
+        def read(self, handle, length, timeout=None, buffer=None):
+            """
+            Reads a HID In report from an open HID device, waiting up to the
+            given timeout for a report to arrive. The report is read into the
+            given buffer if one is supplied, so that repeated reads do not need
+            to allocate any memory.
+
+            .. note:: Calls accessing the same device handle must be serialized
+                      by the caller (although a read may run alongside other
+                      calls), and the handle must not be closed while a call
+                      is in progress.
+
+            :param Handle handle: Device handle to access.
+            :param int length: Maximum length of the In report to read.
+            :param int timeout: Maximum time to wait for a report, in
+                                milliseconds, or `None` to perform a
+                                non-blocking read.
+            :param ctypes.Array buffer: Character buffer of at least `length`
+                                        bytes to read the report into, or
+                                        `None` to allocate a new buffer.
+
+            :rtype: memoryview
+            :return: View of the bytes containing the read In report, which
+                     remains valid until the buffer is next read into. The
                      first byte of the report will be the Report ID of the
                      report that was read.
             """
 
-            data = ctypes.create_string_buffer(length)
+            data = buffer if buffer is not None else ctypes.create_string_buffer(length)
 
-            with self.mutex:
-                if not handle:
-                    raise TransportError("No HID device.")
+            if not handle:
+                raise TransportError("No HID device.")
 
-                result = self.hidapi.hid_read(handle, data, len(data))
+            if timeout is None:
+                result = self.hidapi.hid_read(handle, data, length)
+            else:
+                result = self.hidapi.hid_read_timeout(handle, data, length, timeout)
 
             if result < 0:
                 raise TransportError("Failed to read in report (%d)" % result)
             elif result == 0:
                 return None
 
-            return data.raw[:length]
+            return memoryview(data).cast('B')[:length]
 
     class Device(Transport.Device):
-        def __init__(self, hidapi, device_info):
+        def __init__(self, hidapi, device_info, transport=None):
             """
             Creates a new HID device instance, used to send and receive HID
             reports from/to an attached USB HID device.
 
             :param dict() device_info: Device information dictionary describing
                                        a single unique attached USB HID device.
+            :param LibUSBHIDAPI transport: Transport the device was enumerated
+                                           from, whose hotplug watcher (if any)
+                                           is used to check if the device is
+                                           still connected.
             """
             self.hidapi = hidapi
             self.device_info = device_info
+            self.transport = transport
             self.device_handle = None
+
+            # Per-device locks, serializing access to this device's handle
+            # without blocking access to any other device. Reads use their
+            # own lock, so that they can wait for a report without holding up
+            # writes.
             self.mutex = threading.Lock()
+            self.read_mutex = threading.Lock()
+
+            # Reusable buffer that In reports are read into.
+            self.read_buffer = None
 
         def __del__(self):
             """
@@ -358,7 +488,7 @@ class LibUSBHIDAPI(Transport):
             .. seealso:: See :func:`~~HID.Device.open` for the corresponding
                          open method.
             """
-            with self.mutex:
+            with self.mutex, self.read_mutex:
                 if self.device_handle:
                     self.hidapi.close_device(self.device_handle)
                     self.device_handle = None
@@ -377,13 +507,19 @@ class LibUSBHIDAPI(Transport):
         def connected(self):
             """
             Indicates if the physical HID device this instance is attached to
-            is still connected to the host.
+            is still connected to the host. If a hotplug watcher has been set
+            on the transport, its cached set of attached devices is checked;
+            otherwise the host's HID devices are enumerated.
 
             :rtype: bool
             :return: `True` if the device is still connected, `False` otherwise.
             """
-            with self.mutex:
-                return any([d['path'] == self.device_info['path'] for d in self.hidapi.enumerate()])
+            watcher = self.transport.hotplug_watcher if self.transport is not None else None
+            if watcher is not None and watcher.is_running():
+                return watcher.is_attached(self.device_info['path'])
+
+            vendor_id = self.device_info.get('vendor_id')
+            return any([d['path'] == self.device_info['path'] for d in self.hidapi.enumerate(vendor_id=vendor_id)])
 
         def path(self):
             """
@@ -396,6 +532,65 @@ class LibUSBHIDAPI(Transport):
             """
             return self.device_info['path']
 
+        def vendor_id(self):
+            """
+            Retrieves the USB Vendor ID of the attached HID device.
+
+            :rtype: int
+            :return: USB Vendor ID of the attached device.
+            """
+            return self.device_info['vendor_id']
+
+        def product_id(self):
+            """
+            Retrieves the USB Product ID of the attached HID device.
+
+            :rtype: int
+            :return: USB Product ID of the attached device.
+            """
+            return self.device_info['product_id']
+
+        def serial_number(self):
+            """
+            Retrieves the serial number of the attached HID device, as reported
+            in its USB descriptors when it was enumerated.
+
+            :rtype: str
+            :return: Serial number of the attached device, `None` if unknown.
+            """
+            return self.device_info.get('serial_number')
+
+        def manufacturer(self):
+            """
+            Retrieves the manufacturer name of the attached HID device, as
+            reported in its USB descriptors when it was enumerated.
+
+            :rtype: str
+            :return: Manufacturer name of the attached device, `None` if unknown.
+            """
+            return self.device_info.get('manufacturer_string')
+
+        def product(self):
+            """
+            Retrieves the product name of the attached HID device, as reported
+            in its USB descriptors when it was enumerated.
+
+            :rtype: str
+            :return: Product name of the attached device, `None` if unknown.
+            """
+            return self.device_info.get('product_string')
+
+        def interface_number(self):
+            """
+            Retrieves the USB interface number of the attached HID device, as
+            reported when it was enumerated.
+
+            :rtype: int
+            :return: USB interface number of the attached device, `None` if
+                     unknown.
+            """
+            return self.device_info.get('interface_number')
+
         def write_feature(self, payload):
             """
             Sends a HID Feature report to the open HID device.
@@ -441,19 +636,50 @@ class LibUSBHIDAPI(Transport):
             with self.mutex:
                 return self.hidapi.write(self.device_handle, payload)
 
-        def read(self, length):
+        def write_many(self, payloads):
             """
-            Performs a non-blocking read of a HID In report from the open HID device.
+            Sends a sequence of HID Out reports to the open HID device, in
+            order. The device lock is taken only once for the whole sequence.
 
-            :param int length: Maximum length of the In report to read.
+            :param enumerable() payloads: Enumerable list of reports to send to
+                                          the device, each formatted as per
+                                          :func:`~LibUSBHIDAPI.Device.write`.
 
-            :rtype: list(byte)
-            :return: List of bytes containing the read In report. The first byte
-                     of the report will be the Report ID of the report that was
-                     read.
+            :rtype: int
+            :return: Total number of bytes successfully sent to the device.
             """
             with self.mutex:
-                return self.hidapi.read(self.device_handle, length)
+                return self.hidapi.write_many(self.device_handle, payloads)
+
+        def read(self, length, timeout=None):
+            """
+            Reads a HID In report from the open HID device, waiting up to the
+            given timeout for a report to arrive.
+
+            :param int length: Maximum length of the In report to read.
+            :param int timeout: Maximum time to wait for a report, in
+                                milliseconds, or `None` to return immediately
+                                if no report is available.
+
+            :rtype: memoryview
+            :return: View of the bytes containing the read In report, which is
+                     only valid until the next read from the device. The first
+                     byte of the report will be the Report ID of the report that
+                     was read, or `None` if no report was available.
+            """
+            # Closing the device takes both locks, so that the handle is never
+            # closed while a read is in progress.
+            with self.read_mutex:
+                if self.read_buffer is None or len(self.read_buffer) < length:
+                    self.read_buffer = ctypes.create_string_buffer(length)
+
+                return self.hidapi.read(self.device_handle, length, timeout, self.read_buffer)
+
+    def __init__(self):
+        """
+        Creates a new LibUSB HIDAPI transport instance.
+        """
+        self.hotplug_watcher = None
 
     @staticmethod
     def probe():
@@ -480,4 +706,35 @@ class LibUSBHIDAPI(Transport):
 
         hidapi = LibUSBHIDAPI.Library()
 
-        return [LibUSBHIDAPI.Device(hidapi, d) for d in hidapi.enumerate(vendor_id=vid, product_id=pid)]
+        return [LibUSBHIDAPI.Device(hidapi, d, self) for d in hidapi.enumerate(vendor_id=vid, product_id=pid)]
+
+    def enumerate_products(self, vid, pids):
+        """
+        Enumerates all available USB HID devices on the system with the given
+        USB Vendor ID and any of the given USB Product IDs. The system's HID
+        devices are enumerated only once, regardless of the number of product
+        IDs given.
+
+        :param int vid: USB Vendor ID to filter all devices by.
+        :param enumerable(int) pids: USB Product IDs to filter all devices by.
+
+        :rtype: list(HID.Device)
+        :return: List of discovered USB HID devices.
+        """
+
+        hidapi = LibUSBHIDAPI.Library()
+        pids = set(pids)
+
+        return [LibUSBHIDAPI.Device(hidapi, d, self) for d in hidapi.enumerate(vendor_id=vid) if d['product_id'] in pids]
+
+    def set_hotplug_watcher(self, watcher):
+        """
+        Sets the hotplug watcher whose cached set of attached devices is used
+        to determine if this transport's devices are still connected, instead
+        of enumerating the host's devices each time.
+
+        :param HotplugWatcher watcher: Running hotplug watcher, or `None` to
+                                       stop using a previously set watcher.
+        """
+
+        self.hotplug_watcher = watcher
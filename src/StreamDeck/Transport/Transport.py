@@ -85,6 +85,67 @@ class Transport(ABC):
             """
             pass
 
+        @abstractmethod
+        def vendor_id(self):
+            """
+            Retrieves the USB Vendor ID of the attached device.
+
+            :rtype: int
+            :return: USB Vendor ID of the attached device.
+            """
+            pass
+
+        @abstractmethod
+        def product_id(self):
+            """
+            Retrieves the USB Product ID of the attached device.
+
+            :rtype: int
+            :return: USB Product ID of the attached device.
+            """
+            pass
+
+        def serial_number(self):
+            """
+            Retrieves the serial number of the attached device, as reported
+            when the device was enumerated.
+
+            :rtype: str
+            :return: Serial number of the attached device, `None` if unknown.
+            """
+            return None
+
+        def manufacturer(self):
+            """
+            Retrieves the manufacturer name of the attached device, as reported
+            when the device was enumerated.
+
+            :rtype: str
+            :return: Manufacturer name of the attached device, `None` if unknown.
+            """
+            return None
+
+        def product(self):
+            """
+            Retrieves the product name of the attached device, as reported when
+            the device was enumerated.
+
+            :rtype: str
+            :return: Product name of the attached device, `None` if unknown.
+            """
+            return None
+
+        def interface_number(self):
+            """
+            Retrieves the USB interface number of the attached device, as
+            reported when the device was enumerated.
+
+            :rtype: int
+            :return: USB interface number of the attached device, `None` if
+                     unknown.
+            """
+            return None
+
         @abstractmethod
         def write_feature(self, payload):
             """
@@ -130,17 +191,38 @@ class Transport(ABC):
             """
             pass
 
+        def write_many(self, payloads):
+            """
+            Sends a sequence of HID Out reports to the open HID device, in
+            order. Transports may override this with a version that sends the
+            whole sequence more efficiently than one report at a time.
+
+            :param enumerable() payloads: Enumerable list of reports to send to
+                                          the device, each formatted as per
+                                          :func:`~Transport.Device.write`.
+
+            :rtype: int
+            :return: Total number of bytes successfully sent to the device.
+            """
+            return sum(self.write(payload) for payload in payloads)
+
         @abstractmethod
-        def read(self, length):
+        def read(self, length, timeout=None):
             """
-            Performs a blocking read of a HID In report from the open HID device.
+            Reads a HID In report from the open HID device, waiting up to the
+            given timeout for a report to arrive.
 
             :param int length: Maximum length of the In report to read.
+            :param int timeout: Maximum time to wait for a report, in
+                                milliseconds, or `None` to return immediately
+                                if no report is available.
 
             :rtype: list(byte)
             :return: List of bytes containing the read In report. The first byte
                      of the report will be the Report ID of the report that was
-                     read.
+                     read, or `None` if no report was available. Transports may
+                     return a view into a reusable buffer, which is only valid
+                     until the next read from the device.
             """
             pass
 
@@ -169,3 +251,30 @@ class Transport(ABC):
                  transport back-end.
         """
         pass
+
+    def enumerate_products(self, vid, pids):
+        """
+        Enumerates all available devices on the system with the given USB
+        Vendor ID and any of the given USB Product IDs, using the current
+        transport back-end.
+
+        :param int vid: USB Vendor ID to filter all devices by.
+        :param enumerable(int) pids: USB Product IDs to filter all devices by.
+
+        :rtype: list(Transport.Device)
+        :return: List of discovered devices that are available through this
+                 transport back-end.
+        """
+        return [device for pid in pids for device in self.enumerate(vid=vid, pid=pid)]
+
+    def set_hotplug_watcher(self, watcher):
+        """
+        Sets the hotplug watcher whose cached set of attached devices is used
+        to determine if this transport's devices are still connected, instead
+        of enumerating the host's devices each time. Transports that have no
+        use for a hotplug watcher ignore it.
+
+        :param HotplugWatcher watcher: Running hotplug watcher, or `None` to
+                                       stop using a previously set watcher.
+        """
+        pass
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+# Benchmark script measuring how converting a large batch of key images to a
+# StreamDeck's native image format scales with the number of worker processes
+# used by PILHelper.to_native_format_many().
+
+import argparse
+import os
+import time
+
+from PIL import ImageDraw
+from StreamDeck.Devices.StreamDeckMini import StreamDeckMini
+from StreamDeck.Devices.StreamDeckOriginal import StreamDeckOriginal
+from StreamDeck.Devices.StreamDeckOriginalV2 import StreamDeckOriginalV2
+from StreamDeck.Devices.StreamDeckXL import StreamDeckXL
+from StreamDeck.ImageHelpers import PILHelper
+from StreamDeck.Transport.Dummy import Dummy
+
+
+DECK_CLASSES = {
+    "original": StreamDeckOriginal,
+    "originalv2": StreamDeckOriginalV2,
+    "mini": StreamDeckMini,
+    "xl": StreamDeckXL,
+}
+
+
+# Creates the given number of distinct key images for the given deck.
+def create_test_images(deck, count):
+    images = []
+
+    for i in range(count):
+        image = PILHelper.create_image(deck, background=(i % 256, (i * 7) % 256, (i * 13) % 256))
+
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((i % image.width, 0, image.width, image.height), fill="white")
+        draw.text((5, image.height // 2), str(i), fill="black")
+
+        images.append(image)
+
+    return images
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StreamDeck Library parallel image conversion benchmark.")
+    parser.add_argument("--model", choices=DECK_CLASSES.keys(), default="xl", help="StreamDeck model to convert images for")
+    parser.add_argument("--images", type=int, default=1000, help="Number of images to convert")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to benchmark (default: powers of two up to the CPU count)")
+    args = parser.parse_args()
+
+    deck = DECK_CLASSES[args.model](Dummy.Device("bench"))
+    images = create_test_images(deck, args.images)
+
+    worker_counts = args.workers
+    if not worker_counts:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = sorted({min(2 ** i, cpu_count) for i in range(cpu_count.bit_length() + 1)})
+
+    print("{:>8} {:>12} {:>10}".format("Workers", "Images/s", "Speedup"))
+
+    single_worker_rate = None
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        PILHelper.to_native_format_many(deck, images, workers=workers)
+        rate = len(images) / (time.perf_counter() - start_time)
+
+        single_worker_rate = single_worker_rate or rate
+
+        print("{:>8} {:>12.1f} {:>9.2f}x".format(workers, rate, rate / single_worker_rate))
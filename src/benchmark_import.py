@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+# Benchmark script measuring the startup cost of the library, as seen by short
+# lived scripts: each scenario is run in a fresh Python interpreter, and the
+# time taken (over that of an empty interpreter) is reported along with the
+# library modules it ended up importing.
+
+import argparse
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+import time
+
+
+SCENARIOS = {
+    "Import": """
+from StreamDeck.DeviceManager import DeviceManager
+""",
+    "Enumerate (Dummy)": """
+from StreamDeck.DeviceManager import DeviceManager
+DeviceManager(transport="dummy").enumerate()
+""",
+    "Pedal Only": """
+from StreamDeck.DeviceManager import DeviceManager
+DeviceManager._get_device_class(DeviceManager.USB_VID_ELGATO, DeviceManager.USB_PID_STREAMDECK_PEDAL)
+""",
+}
+
+REPORT_MODULES = """
+import sys
+print(len([m for m in sys.modules if m.startswith("StreamDeck")]))
+"""
+
+
+# Runs the given script in a fresh interpreter, returning the wall time taken
+# and the script's output. Only this benchmark's own fixed scripts are run,
+# with the current interpreter, so no untrusted input reaches the subprocess.
+def run_script(script):
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+
+    start_time = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True).stdout  # nosec B603
+    elapsed = time.perf_counter() - start_time
+
+    return elapsed, output
+
+
+# Runs the given script the given number of times, returning the median time.
+def measure_script(script, runs):
+    return statistics.median(run_script(script)[0] for _ in range(runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StreamDeck Library import time benchmark.")
+    parser.add_argument("--runs", type=int, default=20, help="Number of interpreter runs per scenario")
+    args = parser.parse_args()
+
+    baseline = measure_script("pass", args.runs)
+
+    print("{:>20} {:>12} {:>10}".format("Scenario", "Time (ms)", "Modules"))
+
+    for name, script in SCENARIOS.items():
+        elapsed = measure_script(script, args.runs) - baseline
+        module_count = int(run_script(script + REPORT_MODULES)[1])
+
+        print("{:>20} {:>12.1f} {:>10}".format(name, elapsed * 1000, module_count))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+# Benchmark script comparing the host CPU usage of reading key events from an
+# increasing number of (dummy) StreamDeck devices, using either one internal
+# reader thread per deck, or a single shared reader for all decks.
+
+import argparse
+import time
+
+from StreamDeck.Devices.StreamDeckXL import StreamDeckXL
+from StreamDeck.SharedReader import SharedReader
+from StreamDeck.Transport.Dummy import Dummy
+
+
+# Measures the fraction of process CPU time used over the given duration.
+def measure_cpu_usage(duration):
+    start_cpu = time.process_time()
+    time.sleep(duration)
+    return (time.process_time() - start_cpu) / duration
+
+
+# Opens the given number of dummy decks, each using its own reader thread.
+def benchmark_per_deck_readers(deck_count, poll_hz, duration):
+    decks = [StreamDeckXL(Dummy.Device("bench:{}".format(i))) for i in range(deck_count)]
+
+    for deck in decks:
+        deck.set_poll_frequency(poll_hz)
+        deck.open()
+
+    cpu_usage = measure_cpu_usage(duration)
+
+    for deck in decks:
+        deck.close()
+
+    return cpu_usage
+
+
+# Opens the given number of dummy decks, all read by a single shared reader.
+def benchmark_shared_reader(deck_count, poll_hz, duration):
+    decks = [StreamDeckXL(Dummy.Device("bench:{}".format(i))) for i in range(deck_count)]
+
+    reader = SharedReader(poll_hz=poll_hz)
+    for deck in decks:
+        reader.add_deck(deck)
+        deck.open()
+
+    cpu_usage = measure_cpu_usage(duration)
+
+    for deck in decks:
+        deck.close()
+
+    reader.stop()
+
+    return cpu_usage
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StreamDeck Library key event reader benchmark.")
+    parser.add_argument("--decks", type=int, nargs="+", default=[1, 2, 4, 8, 16, 24], help="Deck counts to benchmark")
+    parser.add_argument("--poll-hz", type=int, default=100, help="Reader poll frequency, in Hz")
+    parser.add_argument("--duration", type=float, default=2.0, help="Measurement duration per run, in seconds")
+    args = parser.parse_args()
+
+    print("{:>6} {:>18} {:>18}".format("Decks", "Per-Deck CPU (%)", "Shared CPU (%)"))
+
+    for deck_count in args.decks:
+        per_deck_usage = benchmark_per_deck_readers(deck_count, args.poll_hz, args.duration)
+        shared_usage = benchmark_shared_reader(deck_count, args.poll_hz, args.duration)
+
+        print("{:>6} {:>18.1f} {:>18.1f}".format(deck_count, per_deck_usage * 100, shared_usage * 100))
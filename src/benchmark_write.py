@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+# Benchmark script measuring the combined key image write throughput of several
+# StreamDeck devices being updated at the same time from separate threads,
+# through the LibUSB HIDAPI transport. By default the HIDAPI library is replaced
+# by a simulated one that takes a fixed time to send each report, so that the
+# effect of the transport's locking can be measured without any attached
+# devices.
+
+import argparse
+import threading
+import time
+
+from StreamDeck.DeviceManager import DeviceManager
+from StreamDeck.Devices.StreamDeckXL import StreamDeckXL
+from StreamDeck.Transport.LibUSBHIDAPI import LibUSBHIDAPI
+
+
+# Stand-in for the HIDAPI library, where each report write takes a fixed amount
+# of time (without holding the Python interpreter lock), much like a real USB
+# transfer.
+class SimulatedHIDAPI:
+    def __init__(self, report_time):
+        self.report_time = report_time
+
+    def hid_open_path(self, path):
+        return hash(path) or 1
+
+    def hid_close(self, handle):
+        pass
+
+    def hid_set_nonblocking(self, handle, nonblock):
+        return 0
+
+    def hid_write(self, handle, data, length):
+        time.sleep(self.report_time)
+        return length
+
+    def hid_read(self, handle, data, length):
+        return 0
+
+    def hid_read_timeout(self, handle, data, length, timeout):
+        time.sleep(timeout / 1000)
+        return 0
+
+    def hid_send_feature_report(self, handle, data, length):
+        time.sleep(self.report_time)
+        return length
+
+    def hid_get_feature_report(self, handle, data, length):
+        time.sleep(self.report_time)
+        return length
+
+
+# LibUSB HIDAPI library wrapper, using a simulated HIDAPI library.
+class SimulatedLibrary(LibUSBHIDAPI.Library):
+    REPORT_TIME = 0
+
+    def _load_hidapi_library(self, library_search_list):
+        return SimulatedHIDAPI(self.REPORT_TIME)
+
+
+# Creates the given number of StreamDeck XL devices using the simulated HIDAPI
+# library.
+def create_simulated_decks(deck_count, report_time):
+    SimulatedLibrary.REPORT_TIME = report_time
+    library = SimulatedLibrary()
+
+    return [StreamDeckXL(LibUSBHIDAPI.Device(library, {'path': "sim:{}".format(i)})) for i in range(deck_count)]
+
+
+# Writes the given number of full frames (an image on every key) to each of the
+# given decks at the same time, one thread per deck, and returns the combined
+# number of key images written per second.
+def measure_write_throughput(decks, frame_count):
+    def write_frames(deck, key_image):
+        for _ in range(frame_count):
+            deck.set_key_images({k: key_image for k in range(deck.key_count())})
+
+    threads = []
+    for deck in decks:
+        key_image = deck.prepare_key_image(bytes(deck.IMAGE_REPORT_PAYLOAD_LENGTH * 4))
+        threads.append(threading.Thread(target=write_frames, args=[deck, key_image]))
+
+    start_time = time.monotonic()
+
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    elapsed = time.monotonic() - start_time
+    return sum(deck.key_count() * frame_count for deck in decks) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StreamDeck Library multi-deck write throughput benchmark.")
+    parser.add_argument("--decks", type=int, nargs="+", default=[1, 2, 4, 8], help="Deck counts to benchmark (simulated decks only)")
+    parser.add_argument("--frames", type=int, default=10, help="Number of full frames to write to each deck")
+    parser.add_argument("--report-time", type=float, default=0.0005, help="Simulated time to send each report, in seconds")
+    parser.add_argument("--hardware", action="store_true", help="Benchmark all attached decks instead of simulated decks")
+    args = parser.parse_args()
+
+    if args.hardware:
+        attached_decks = [deck for deck in DeviceManager().enumerate() if deck.is_visual()]
+        runs = [attached_decks[:n] for n in range(1, len(attached_decks) + 1)]
+    else:
+        runs = [create_simulated_decks(n, args.report_time) for n in args.decks]
+
+    print("{:>6} {:>16} {:>12}".format("Decks", "Key Images/s", "Speedup"))
+
+    single_deck_throughput = None
+    for decks in runs:
+        for deck in decks:
+            deck.open()
+
+        throughput = measure_write_throughput(decks, args.frames)
+        single_deck_throughput = single_deck_throughput or throughput
+
+        for deck in decks:
+            deck.close()
+
+        print("{:>6} {:>16.1f} {:>11.2f}x".format(len(decks), throughput, throughput / single_deck_throughput))
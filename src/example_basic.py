@@ -16,10 +16,15 @@ import threading
 from PIL import Image, ImageDraw, ImageFont
 from StreamDeck.DeviceManager import DeviceManager
 from StreamDeck.ImageHelpers import PILHelper
+from StreamDeck.ImageHelpers.ImageCache import NativeImageCache
 
 # Folder location of image assets used by this example.
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), "Assets")
 
+# Cache of rendered key images, so that each combination of icon and label is
+# only rendered once no matter how often a key is pressed.
+key_image_cache = NativeImageCache()
+
 
 # Generates a custom tile with run-time generated text and custom image via the
 # PIL module.
@@ -69,8 +74,11 @@ def update_key_image(deck, key, state):
     # Determine what icon and label to use on the generated key.
     key_style = get_key_style(deck, key, state)
 
-    # Generate the custom key with the requested image and label.
-    image = render_key_image(deck, key_style["icon"], key_style["font"], key_style["label"])
+    # Generate the custom key with the requested image and label, or reuse a
+    # previously generated one.
+    image = key_image_cache.get_or_create(
+        deck, (key_style["icon"], key_style["font"], key_style["label"]),
+        lambda: render_key_image(deck, key_style["icon"], key_style["font"], key_style["label"]))
 
     # Use a scoped-with on the deck to ensure we're the only thread using it
     # right now.
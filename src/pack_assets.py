@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+#         Python Stream Deck Library
+#      Released under the MIT license
+#
+#   dean [at] fourwalledcubicle [dot] com
+#         www.fourwalledcubicle.com
+#
+
+# Packs a directory of images into an asset bundle for a given StreamDeck
+# model, so that applications can load the pre-converted key images at startup
+# without decoding or encoding any images.
+
+import argparse
+
+from StreamDeck.DeviceManager import DeviceManager
+from StreamDeck.ImageHelpers import AssetBundle
+
+
+if __name__ == "__main__":
+    # The dummy transport provides one deck of each model, which is all that
+    # is needed to determine each model's native key image format.
+    decks = {deck.deck_type(): deck for deck in DeviceManager(transport="dummy").enumerate() if deck.is_visual()}
+
+    parser = argparse.ArgumentParser(description="StreamDeck asset bundle packer.")
+    parser.add_argument("model", choices=sorted(decks.keys()), help="StreamDeck model to create the bundle for")
+    parser.add_argument("directory", help="Directory of images to pack")
+    parser.add_argument("bundle", help="Path of the bundle file to create")
+    parser.add_argument("--margins", type=int, nargs=4, default=[0, 0, 0, 0], help="Margin pixels in (top, right, bottom, left) order")
+    parser.add_argument("--background", default="black", help="Background color of the key images")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes, 0 to use one per CPU core")
+    args = parser.parse_args()
+
+    names = AssetBundle.pack(decks[args.model], args.directory, args.bundle, margins=args.margins, background=args.background, workers=args.workers)
+    print("Packed {} asset(s) for {} into {}.".format(len(names), args.model, args.bundle))
@@ -8,13 +8,157 @@
 #
 
 import argparse
+import asyncio
+import contextlib
+import io
 import logging
+import os
 import sys
+import tempfile
+import threading
+import time
+import types
 
+from StreamDeck.Animator import Animator
+from StreamDeck.AsyncStreamDeck import AsyncStreamDeck
 from StreamDeck.DeviceManager import DeviceManager
-from StreamDeck.ImageHelpers import PILHelper
+from StreamDeck.HotplugWatcher import HotplugWatcher, PollingHotplugSource
+from StreamDeck.ImageHelpers import AssetBundle, BMPHelper, PILHelper
+from StreamDeck.ImageHelpers.ImageCache import NativeFrameCache, NativeImageCache
+from StreamDeck.SharedReader import SharedReader
+from StreamDeck.Transport.LibUSBHIDAPI import LibUSBHIDAPI
+from StreamDeck.Transport.Transport import Transport, TransportError
 from PIL import Image, ImageDraw
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def check(condition, message):
+    if not condition:
+        logging.error("Error: Check failed: {}".format(message))
+        sys.exit(1)
+
+
+class FakeHIDAPI:
+    """
+    Stand-in for the LibUSB HIDAPI library, recording the calls made to it, so
+    that the LibUSB HIDAPI transport can be tested without the library or any
+    attached devices.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.devices = []
+        self.reports = []
+        self.written = []
+
+    def hid_enumerate(self, vendor_id, product_id):
+        self.calls.append(("hid_enumerate", vendor_id, product_id))
+
+        device_enumeration = None
+        for device in reversed(self.devices):
+            if vendor_id not in (0, device['vendor_id']) or product_id not in (0, device['product_id']):
+                continue
+
+            device_info = types.SimpleNamespace(
+                path=device['path'].encode('utf-8'), vendor_id=device['vendor_id'], product_id=device['product_id'],
+                serial_number=None, manufacturer_string=None, product_string=None, interface_number=0,
+                next=device_enumeration)
+            device_enumeration = types.SimpleNamespace(contents=device_info)
+
+        return device_enumeration
+
+    def hid_free_enumeration(self, device_enumeration):
+        pass
+
+    def hid_open_path(self, path):
+        return 1
+
+    def hid_set_nonblocking(self, handle, nonblock):
+        return 0
+
+    def hid_close(self, handle):
+        pass
+
+    def hid_write(self, handle, data, length):
+        self.calls.append(("hid_write", length))
+        self.written.append(data)
+        return length
+
+    def hid_read(self, handle, data, length):
+        self.calls.append(("hid_read", None))
+        return self._read_report(data, length)
+
+    def hid_read_timeout(self, handle, data, length, timeout):
+        self.calls.append(("hid_read_timeout", timeout))
+        return self._read_report(data, length)
+
+    def _read_report(self, data, length):
+        if not self.reports:
+            return 0
+
+        report = self.reports.pop(0)[:length]
+        data[:len(report)] = report
+        return len(report)
+
+
+@contextlib.contextmanager
+def fake_hidapi():
+    previous_instance = LibUSBHIDAPI.Library.HIDAPI_INSTANCE
+    LibUSBHIDAPI.Library.HIDAPI_INSTANCE = FakeHIDAPI()
+
+    try:
+        yield LibUSBHIDAPI.Library.HIDAPI_INSTANCE
+    finally:
+        LibUSBHIDAPI.Library.HIDAPI_INSTANCE = previous_instance
+
+
+class LegacyTransportDevice(Transport.Device):
+    """
+    Transport device implementing only the methods required of transports
+    written against earlier versions of the library.
+    """
+
+    def __init__(self):
+        self.reports = []
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def is_open(self):
+        return True
+
+    def connected(self):
+        return True
+
+    def path(self):
+        return "legacy"
+
+    def vendor_id(self):
+        return None
+
+    def product_id(self):
+        return None
+
+    def write_feature(self, payload):
+        return len(payload)
+
+    def read_feature(self, report_id, length):
+        return bytearray(length)
+
+    def write(self, payload):
+        self.reports.append(bytes(payload))
+        return len(payload)
+
+    def read(self, length, timeout=None):
+        return None
+
 
 def test_pil_helpers(deck):
     if not deck.is_visual():
@@ -25,6 +169,161 @@ def test_pil_helpers(deck):
     test_key_image = PILHelper.create_image(deck)
     test_key_image = PILHelper.to_native_format(deck, test_key_image)
 
+    # Wrappers around a deck must share the cached native format of the deck.
+    check(PILHelper._native_format(AsyncStreamDeck(deck)) is PILHelper._native_format(deck), "wrapped deck native format not cached")
+
+    # Non-square images must be rotated (and so cropped) one step at a time,
+    # not swapped to the other aspect ratio by a single transpose.
+    test_image = Image.new("RGB", (50, 30), "red")
+    expected_image = PILHelper._transform_image(deck.key_image_format(), test_image)
+    expected_image.thumbnail(deck.key_image_format()['size'])
+    test_key_image = Image.open(io.BytesIO(PILHelper.to_native_format(deck, test_image)))
+    check(test_key_image.size == expected_image.size, "non-square image transformed incorrectly")
+
+    test_key_image_size = deck.key_image_format()['size']
+    test_pixels = PILHelper.create_image(deck, background="blue").tobytes()
+    test_key_image = PILHelper.to_native_format_array(deck, test_pixels)
+    test_key_images = PILHelper.to_native_format_array_batch(deck, [test_pixels, bytearray(test_pixels)])
+    check([bytes(i) for i in test_key_images] == [bytes(test_key_image)] * 2, "array batch conversion differs from single conversion")
+
+    if numpy is not None:
+        test_array = numpy.frombuffer(test_pixels, dtype=numpy.uint8).reshape(test_key_image_size[1], test_key_image_size[0], 3)
+        check(bytes(PILHelper.to_native_format_array(deck, test_array)) == bytes(test_key_image), "array conversion differs from buffer conversion")
+
+        for bad_array in [test_array[:, 1:], test_array.astype(numpy.float32)]:
+            try:
+                PILHelper.to_native_format_array_batch(deck, [bad_array])
+                check(False, "invalid image array was accepted")
+            except ValueError:
+                pass
+
+    test_images = [PILHelper.create_image(deck, background=color) for color in ("red", "green", "blue")]
+    test_key_images = PILHelper.to_native_format_many(deck, test_images, workers=1)
+    check(PILHelper.to_native_format_many(deck, test_images, workers=2) == test_key_images, "pooled conversion differs from serial conversion")
+
+    test_animation = io.BytesIO()
+    Image.new("RGB", (40, 20), "red").save(test_animation, "GIF", save_all=True, append_images=[Image.new("RGB", (40, 20), "blue")], duration=50)
+    test_frames = PILHelper.to_native_animation(deck, Image.open(test_animation), margins=[2, 4, 6, 8], workers=1)
+    check([f[0] for f in test_frames] == [bytes(PILHelper.to_native_format(deck, PILHelper.create_scaled_image(deck, Image.new("RGB", (40, 20), c), margins=[2, 4, 6, 8]))) for c in ("red", "blue")], "animation frames scaled incorrectly")
+    check(PILHelper.to_native_animation(deck, Image.open(test_animation), margins=[2, 4, 6, 8], workers=2) == test_frames, "pooled animation conversion differs from serial conversion")
+
+
+def test_bmp_helper(deck):
+    if not deck.is_visual() or deck.key_image_format()['format'] != "BMP":
+        return
+
+    test_image = PILHelper.create_image(deck)
+    ImageDraw.Draw(test_image).rectangle((0, 0, test_image.width // 2, test_image.height // 4), fill="red")
+
+    native_image = BMPHelper.to_native_format(deck, test_image.tobytes())
+    check(native_image == bytes(PILHelper.to_native_format(deck, test_image)), "BMP helper output differs from PIL helper output")
+
+    # The slicing and NumPy encoders must match, whichever path the deck uses.
+    image_format = deck.key_image_format()
+    transform = BMPHelper._plane_transform(image_format['rotation'], image_format['flip'])
+    check(BMPHelper._encode_buffer(image_format, transform, test_image.tobytes()) == native_image, "BMP buffer encoder output differs from PIL helper output")
+
+    if numpy is not None:
+        check(BMPHelper.to_native_format(deck, numpy.asarray(test_image)) == native_image, "BMP array encoder output differs from PIL helper output")
+
+    with deck:
+        deck.open()
+        deck.set_key_image(0, native_image)
+        deck.close()
+
+
+def test_image_cache(deck):
+    if not deck.is_visual():
+        return
+
+    test_image = PILHelper.create_image(deck, background="red")
+    native_image = PILHelper.to_native_format(deck, test_image)
+
+    cache = NativeImageCache(max_bytes=len(native_image) * 2)
+
+    check(cache.to_native_format(deck, test_image) == native_image, "cached image differs from converted image")
+    check(cache.to_native_format(deck, test_image) == native_image, "cached image differs from converted image")
+    check(cache.hit_rate() == 0.5, "unexpected cache hit rate")
+
+    cache.get_or_create(deck, "a", lambda: native_image)
+    cache.get_or_create(deck, "b", lambda: native_image)
+    check(cache.get(deck, cache.image_key(test_image)) is None, "least recently used image was not evicted")
+    check(cache.size() == len(native_image) * 2, "unexpected cache size")
+
+    cache.clear()
+    check(cache.size() == 0 and cache.hit_rate() == 0.0, "cache was not cleared")
+
+
+def test_frame_cache(deck):
+    if not deck.is_visual():
+        return
+
+    frames = [(PILHelper.to_native_format(deck, PILHelper.create_image(deck, background=color)), 0.1) for color in ["red", "blue"]]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, "frames.cache")
+
+        cache = NativeFrameCache(cache_path)
+        check(cache.get(deck, "test") is None, "empty cache returned frames")
+        cache.put(deck, "test", frames)
+
+        with open(cache_path, 'ab') as f:
+            f.write(b'partial entry')
+
+        cache = NativeFrameCache(cache_path)
+        cached_frames = cache.get(deck, "test")
+        check([(bytes(image), duration) for image, duration in cached_frames] == [(bytes(image), duration) for image, duration in frames], "reloaded frames differ from cached frames")
+
+        other_cache = NativeFrameCache(cache_path)
+        other_cache.put(deck, "other", frames[:1])
+        check(cache.put(deck, "more", frames[1:]) is not None, "frames were not appended after partial entry")
+        check(NativeFrameCache(cache_path).get(deck, "other") is not None, "frames appended by another cache were lost")
+
+        with deck:
+            deck.open()
+            deck.set_key_image(0, cached_frames[0][0])
+            deck.close()
+
+        other_cache.clear()
+        check(bytes(cached_frames[1][0]) == frames[1][0], "cached frames changed after cache was cleared")
+        check(NativeFrameCache(cache_path).get(deck, "test") is None, "cache was not cleared")
+
+        del cached_frames
+        cache.close()
+        other_cache.close()
+
+
+def test_asset_bundle(deck):
+    if not deck.is_visual():
+        return
+
+    with tempfile.TemporaryDirectory() as bundle_dir:
+        bundle_path = os.path.join(bundle_dir, "assets.bundle")
+
+        assets_path = os.path.join(os.path.dirname(__file__), "Assets")
+
+        names = AssetBundle.pack(deck, assets_path, bundle_path)
+        check("Exit.png" in names, "asset missing from bundle")
+
+        bundle = AssetBundle.AssetBundle(bundle_path)
+        check(bundle.names() == names, "loaded bundle asset names differ from packed names")
+
+        key_image = bundle.key_image(deck, "Exit.png")
+        test_key_image = deck.prepare_key_image(PILHelper.to_native_animation(deck, Image.open(os.path.join(assets_path, "Exit.png")))[0][0])
+        check(key_image.digest == test_key_image.digest, "bundle image differs from converted image")
+
+        with deck:
+            deck.open()
+            deck.set_key_images({key: key_image for key in range(deck.key_count())})
+            deck.close()
+
+        page = bytes(key_image.pages[0][1])
+        AssetBundle.pack(deck, assets_path, bundle_path, background="red")
+        check(bytes(key_image.pages[0][1]) == page, "loaded bundle changed when bundle was re-packed")
+
+        bundle.close()
+        check(AssetBundle.AssetBundle(bundle_path).key_image(deck, "Exit.png").digest != key_image.digest, "re-packed bundle was not replaced")
+
 
 def test_basic_apis(deck):
     with deck:
@@ -37,6 +336,12 @@ def test_basic_apis(deck):
         key_layout = deck.key_layout()     # noqa: F841
         image_format = deck.key_image_format() if deck.is_visual() else None     # noqa: F841
         key_states = deck.key_states()     # noqa: F841
+        vendor_id = deck.vendor_id()     # noqa: F841
+        product_id = deck.product_id()     # noqa: F841
+        serial_number = deck.serial_number()     # noqa: F841
+        manufacturer = deck.manufacturer()     # noqa: F841
+        product_name = deck.product_name()     # noqa: F841
+        interface_number = deck.interface_number()     # noqa: F841
 
         deck.set_key_callback(None)
         deck.reset()
@@ -50,6 +355,193 @@ def test_basic_apis(deck):
             deck.set_key_image(0, None)
             deck.set_key_image(0, test_key_image)
 
+            deck.set_key_images({0: None, 1: test_key_image})
+
+            prepared_key_image = deck.prepare_key_image(test_key_image)
+            deck.set_key_image(0, prepared_key_image)
+            deck.set_key_images({1: prepared_key_image, 2: prepared_key_image})
+
+            deck.clear_keys([0, 1])
+            deck.clear_keys()
+
+        deck.refresh_info()
+
+        deck.close()
+
+        serial_number = deck.get_serial_number()     # noqa: F841
+        firmware_version = deck.get_firmware_version()     # noqa: F841
+
+
+def test_read_timeout(deck):
+    # Key reports are waited for within the transport, rather than by the
+    # reader thread sleeping between non-blocking reads.
+    with fake_hidapi() as hidapi:
+        device = LibUSBHIDAPI.Device(LibUSBHIDAPI.Library(), {'path': "fake"})
+        device.open()
+        device.read(8, timeout=50)
+        device.read(8)
+        device.close()
+
+    check(hidapi.calls == [("hid_read_timeout", 50), ("hid_read", None)], "unexpected HID read calls")
+
+    timeouts = []
+
+    def read_key_states(timeout=None):
+        timeouts.append(timeout)
+        time.sleep(0.01)
+        return None
+
+    deck._read_key_states = read_key_states
+
+    with deck:
+        deck.open()
+        time.sleep(0.05)
+        deck.close()
+
+    del deck._read_key_states
+    check(timeouts and None not in timeouts, "deck reader read key reports without waiting for them")
+
+
+def test_device_locks(deck):
+    # Each device has its own locks, and writes are not held up by a read
+    # waiting for a report or by other devices.
+    with fake_hidapi() as hidapi:
+        library = LibUSBHIDAPI.Library()
+        device = LibUSBHIDAPI.Device(library, {'path': "fake"})
+        other_device = LibUSBHIDAPI.Device(library, {'path': "other"})
+
+        check(device.mutex is not other_device.mutex, "device lock shared between devices")
+
+        device.open()
+
+        with device.read_mutex, other_device.mutex, library.mutex:
+            write_thread = threading.Thread(target=device.write, args=[b'\x02\x00'])
+            write_thread.daemon = True
+            write_thread.start()
+            write_thread.join(1)
+
+            check(not write_thread.is_alive(), "device write waited for another lock")
+
+        device.close()
+
+    check(hidapi.calls == [("hid_write", 2)], "unexpected HID write calls")
+
+
+def test_device_registry(deck):
+    # Device classes registered by name are only imported once a device of
+    # that model is found, and the HIDAPI library is not loaded unless the
+    # LibUSB transport is used.
+    device_key = (DeviceManager.USB_VID_ELGATO, 0xfff0)
+    DeviceManager.register_device_class(*device_key, ".Devices.StreamDeckMini.StreamDeckMini")
+
+    try:
+        check(isinstance(DeviceManager.DEVICE_CLASSES[device_key], str), "registered device class was imported up front")
+
+        decks = [d for d in DeviceManager(transport="dummy").enumerate() if d.product_id() == device_key[1]]
+        check(len(decks) == 1 and type(decks[0]).__name__ == "StreamDeckMini", "registered device class not used")
+        check(DeviceManager.DEVICE_CLASSES[device_key] is type(decks[0]), "imported device class not cached")
+
+        class CustomStreamDeck(type(decks[0])):
+            pass
+
+        DeviceManager.register_device_class(*device_key, CustomStreamDeck)
+        decks = [d for d in DeviceManager(transport="dummy").enumerate() if d.product_id() == device_key[1]]
+        check(len(decks) == 1 and type(decks[0]) is CustomStreamDeck, "replacement device class not used")
+    finally:
+        del DeviceManager.DEVICE_CLASSES[device_key]
+
+    check(LibUSBHIDAPI.Library.HIDAPI_INSTANCE is None, "HIDAPI library loaded without the LibUSB transport")
+
+
+def test_enumeration(deck):
+    # Devices of all StreamDeck models are found with a single enumeration of
+    # the host's devices.
+    with fake_hidapi() as hidapi:
+        hidapi.devices = [
+            {'path': "original", 'vendor_id': DeviceManager.USB_VID_ELGATO, 'product_id': DeviceManager.USB_PID_STREAMDECK_ORIGINAL},
+            {'path': "unknown", 'vendor_id': DeviceManager.USB_VID_ELGATO, 'product_id': 0xffff},
+            {'path': "xl", 'vendor_id': DeviceManager.USB_VID_ELGATO, 'product_id': DeviceManager.USB_PID_STREAMDECK_XL},
+        ]
+
+        manager = DeviceManager(transport="dummy")
+        manager.transport = LibUSBHIDAPI()
+        decks = manager.enumerate()
+
+    check([(d.id(), d.deck_type()) for d in decks] == [("original", "Stream Deck Original"), ("xl", "Stream Deck XL")], "unexpected enumerated decks")
+    check(hidapi.calls == [("hid_enumerate", DeviceManager.USB_VID_ELGATO, 0)], "host devices enumerated more than once")
+
+
+def test_read_buffer(deck):
+    # In reports are read into a buffer reused for every read of the device,
+    # and writable reports are written without being copied.
+    with fake_hidapi() as hidapi:
+        hidapi.reports = [b'\x01\x01', b'\x01\x00']
+
+        device = LibUSBHIDAPI.Device(LibUSBHIDAPI.Library(), {'path': "fake"})
+        device.open()
+
+        first_report = device.read(2)
+        check(isinstance(first_report, memoryview) and bytes(first_report) == b'\x01\x01', "unexpected first In report")
+        first_buffer = first_report.obj
+
+        second_report = device.read(2)
+        check(second_report.obj is first_buffer and bytes(second_report) == b'\x01\x00', "read buffer not reused")
+        check(device.read(2) is None, "In report returned when none was available")
+
+        report = bytearray(b'\x02\x00')
+        device.write(report)
+        report[1] = 0xff
+        check(bytes(hidapi.written[-1]) == bytes(report), "writable Out report was copied")
+
+        del first_report, second_report
+        device.close()
+
+
+def test_transport_device(deck):
+    # Device information is available from enumeration, without opening the
+    # deck, and transports that do not provide it report it as unknown.
+    check(deck.serial_number() is not None and deck.serial_number() == deck.device.serial_number(), "deck serial number not reported from enumeration")
+
+    device = LegacyTransportDevice()
+    check(device.serial_number() is None and device.manufacturer() is None, "unexpected default device information")
+    check(device.product() is None and device.interface_number() is None, "unexpected default device information")
+
+    # Transports without a bulk write send each report in turn.
+    check(device.write_many([b'\x02\x01', bytearray(b'\x02\x02')]) == 4, "unexpected number of bytes written")
+    check(device.reports == [b'\x02\x01', b'\x02\x02'], "reports not written in order")
+
+    if not deck.is_visual():
+        return
+
+    # Several key images are sent to the transport in a single bulk write.
+    write_calls = []
+
+    def write_many(payloads):
+        write_calls.append([bytes(payload) for payload in payloads])
+        return sum(len(payload) for payload in write_calls[-1])
+
+    with deck:
+        deck.open()
+
+        deck.device.write_many = write_many
+        deck.set_key_images({0: None, 1: None})
+        del deck.device.write_many
+
+        deck.close()
+
+    check(len(write_calls) == 1 and len(write_calls[0]) >= 2, "key images not sent in one bulk write")
+
+
+def test_reader_error(deck):
+    with deck:
+        deck.open()
+
+        # Closing the transport underneath the reader thread makes it close
+        # the deck, which must not block re-opening it while locked.
+        deck.device.close()
+        time.sleep(0.1)
+
+        deck.open()
         deck.close()
 
 
@@ -70,6 +562,306 @@ def test_key_pattern(deck):
         deck.close()
 
 
+def test_key_image_dedup(deck):
+    if not deck.is_visual():
+        return
+
+    test_key_image = PILHelper.create_image(deck)
+    test_key_image = PILHelper.to_native_format(deck, test_key_image)
+
+    with deck:
+        deck.open()
+        deck.set_key_image_dedup(True)
+
+        deck.set_key_image(0, test_key_image)
+        deck.set_key_image(0, test_key_image)
+        deck.set_key_images({0: test_key_image, 1: test_key_image})
+
+        check(deck.skipped_key_image_writes() == 2, "unexpected number of skipped key image writes")
+
+        deck.set_key_image_dedup(False)
+        deck.close()
+
+
+def test_background_writer(deck):
+    if not deck.is_visual():
+        return
+
+    test_key_images = [
+        PILHelper.to_native_format(deck, PILHelper.create_image(deck, background=color))
+        for color in ("red", "green", "blue")
+    ]
+
+    with deck:
+        deck.open()
+
+    deck.set_background_writer(True)
+
+    for test_key_image in test_key_images:
+        deck.set_key_image(0, test_key_image)
+        deck.set_key_images({1: test_key_image, 2: None})
+
+    deck.flush()
+
+    # Errors sending queued images must be reported, not silently dropped.
+    def failing_write_many(reports):
+        raise TransportError("Simulated write failure.")
+
+    deck.device.write_many = failing_write_many
+    deck.set_key_image(0, test_key_images[0])
+
+    try:
+        deck.flush()
+        check(False, "background write error was not reported")
+    except TransportError:
+        pass
+
+    # Other errors must be reported in the same way, without stopping the
+    # writer thread.
+    def invalid_write_many(reports):
+        raise ValueError("Simulated invalid image.")
+
+    deck.device.write_many = invalid_write_many
+    deck.set_key_image(0, test_key_images[1])
+
+    try:
+        deck.flush()
+        check(False, "background write error was not reported")
+    except ValueError:
+        pass
+
+    del deck.device.write_many
+
+    deck.set_key_image(0, test_key_images[2])
+    deck.flush()
+    check(deck.write_thread.is_alive(), "background writer stopped after a write error")
+
+    deck.set_background_writer(False)
+
+    # Closing the deck must also stop the background writer.
+    deck.set_background_writer(True)
+    write_thread = deck.write_thread
+
+    with deck:
+        deck.close()
+
+    write_thread.join(1)
+    check(not write_thread.is_alive(), "background writer still running after close")
+
+
+def test_animator(deck):
+    if not deck.is_visual():
+        return
+
+    test_frames = [
+        (PILHelper.to_native_format(deck, PILHelper.create_image(deck, background=color)), 0.01)
+        for color in ("red", "green", "blue")
+    ]
+
+    with deck:
+        deck.open()
+
+    animator = Animator(deck)
+
+    try:
+        animator.set_key_animation(deck.key_count(), test_frames)
+        check(False, "animation was set on a key past the last key")
+    except IndexError:
+        pass
+
+    animator.set_key_animation(0, test_frames)
+    animator.set_key_animation(1, test_frames[:1])
+    animator.start()
+    time.sleep(0.1)
+    animator.stop()
+
+    check(animator.target_fps() > 0, "animator target FPS not set")
+    check(animator.achieved_fps() > 0, "animator did not update any keys")
+
+    animator.clear_key_animation(0)
+    animator.start()
+    time.sleep(0.1)
+    animator.stop()
+
+    check(animator.shown_frame_count == 1, "static key image was sent more than once")
+
+    # The animator stops by itself when the deck is closed, and must be able
+    # to be restarted once the deck is re-opened.
+    animator.set_key_animation(0, test_frames)
+    animator.start()
+
+    with deck:
+        deck.close()
+
+    time.sleep(0.05)
+
+    with deck:
+        deck.open()
+
+    animator.start()
+    check(animator.is_running(), "animator did not restart")
+    animator.stop()
+
+    with deck:
+        deck.close()
+
+
+def test_async_apis(deck):
+    async def run_async_apis():
+        async_deck = AsyncStreamDeck(deck)
+
+        await async_deck.open()
+        await async_deck.reset()
+
+        if async_deck.is_visual():
+            await async_deck.set_brightness(30)
+            await async_deck.set_key_image(0, None)
+            await async_deck.set_key_images({0: None, 1: None})
+
+        def previous_callback(deck, key, state):
+            pass
+
+        deck.set_key_callback(previous_callback)
+
+        events = async_deck.events()
+        next_event = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        # Events beyond the queue limit replace older events of the same key,
+        # and never block the deck's reader thread.
+        loop = asyncio.get_running_loop()
+        for i in range(async_deck.max_pending_events + 2):
+            await loop.run_in_executor(None, deck.key_callback, deck, 0, i % 2 == 0)
+        await loop.run_in_executor(None, deck.key_callback, deck, 1, True)
+
+        check(await next_event == (0, True), "unexpected key event")
+
+        received_events = []
+        try:
+            while True:
+                received_events.append(await asyncio.wait_for(events.__anext__(), 0.1))
+        except asyncio.TimeoutError:
+            pass
+
+        check(async_deck.dropped_events() > 0, "discarded key events were not counted")
+        check([event for event in received_events if event[0] == 0][-1] == (0, False), "latest key state was not delivered")
+        check((1, True) in received_events, "key event of another key was discarded")
+        check(deck.key_callback is previous_callback, "previous key callback was not restored")
+
+        deck.set_key_callback(None)
+
+        await async_deck.close()
+
+    asyncio.run(run_async_apis())
+
+
+def test_shared_reader(deck):
+    reader = SharedReader()
+    reader.add_deck(deck)
+
+    with deck:
+        deck.open()
+
+    time.sleep(0.05)
+    reader.remove_deck(deck)
+
+    with deck:
+        deck.close()
+
+    # A burst of key reports must be read in one pass, without waiting for
+    # the poll interval between reports.
+    pending_key_states = []
+    report_ready = threading.Event()
+    events = []
+
+    def read_key_states(timeout=None):
+        if not pending_key_states and timeout is not None:
+            report_ready.wait(timeout / 1000)
+
+        report_ready.clear()
+        return pending_key_states.pop(0) if pending_key_states else None
+
+    deck._read_key_states = read_key_states
+    deck.set_key_callback(lambda deck, key, state: events.append((key, state)))
+
+    with deck:
+        deck.open()
+
+    reader = SharedReader(poll_hz=1)
+    reader.add_deck(deck)
+    time.sleep(0.05)
+
+    for state in (True, False, True):
+        pending_key_states.append([state] + [False] * (deck.key_count() - 1))
+    report_ready.set()
+
+    time.sleep(0.1)
+    check(events == [(0, True), (0, False), (0, True)], "burst of key reports was not read at once")
+
+    with deck:
+        deck.close()
+
+    reader.stop()
+
+    deck.set_key_callback(None)
+    del deck._read_key_states
+
+
+def test_hotplug_watcher(deck):
+    attached_paths = [deck.id()]
+    events = []
+
+    def failing_callback(path, attached):
+        raise RuntimeError("Simulated callback failure.")
+
+    watcher = HotplugWatcher(lambda: attached_paths, PollingHotplugSource(interval=0.01))
+    watcher.add_callback(failing_callback)
+    watcher.add_callback(lambda path, attached: events.append((path, attached)))
+    watcher.start()
+
+    check(watcher.is_attached(deck.id()), "attached device not reported")
+
+    attached_paths = None
+    time.sleep(0.05)
+    check(watcher.is_running(), "hotplug watcher stopped after an enumeration error")
+
+    attached_paths = []
+    time.sleep(0.1)
+    check(not watcher.is_attached(deck.id()), "removed device still reported")
+    check(watcher.is_running(), "hotplug watcher stopped after a callback error")
+
+    watcher.stop()
+
+    check(events == [(deck.id(), True), (deck.id(), False)], "unexpected hotplug events")
+
+    # A failed first enumeration must close the event source and leave the
+    # watcher stopped.
+    source = PollingHotplugSource(interval=0.01)
+    watcher = HotplugWatcher(lambda: None, source)
+
+    try:
+        watcher.start()
+        check(False, "hotplug watcher enumeration error was not reported")
+    except TypeError:
+        pass
+
+    check(not watcher.is_running(), "hotplug watcher left running after a failed start")
+    check(not source.wait(), "hotplug event source left open after a failed start")
+
+    # Each transport instance has its own hotplug watcher.
+    transport, other_transport = LibUSBHIDAPI(), LibUSBHIDAPI()
+    transport.set_hotplug_watcher(watcher)
+    check(other_transport.hotplug_watcher is None, "hotplug watcher shared between transports")
+
+    manager = DeviceManager(transport="dummy")
+    manager.start_hotplug_watcher(PollingHotplugSource(interval=0.01))
+
+    with deck:
+        check(deck.connected(), "deck not reported as connected")
+
+    manager.stop_hotplug_watcher()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
@@ -91,8 +883,25 @@ if __name__ == "__main__":
 
     tests = {
         "PIL Helpers": test_pil_helpers,
+        "BMP Helper": test_bmp_helper,
+        "Image Cache": test_image_cache,
+        "Frame Cache": test_frame_cache,
+        "Asset Bundle": test_asset_bundle,
         "Basic APIs": test_basic_apis,
+        "Read Timeout": test_read_timeout,
+        "Device Locks": test_device_locks,
+        "Enumeration": test_enumeration,
+        "Device Registry": test_device_registry,
+        "Read Buffer": test_read_buffer,
+        "Transport Device": test_transport_device,
+        "Reader Error": test_reader_error,
         "Key Pattern": test_key_pattern,
+        "Key Image Dedup": test_key_image_dedup,
+        "Background Writer": test_background_writer,
+        "Animator": test_animator,
+        "Async APIs": test_async_apis,
+        "Shared Reader": test_shared_reader,
+        "Hotplug Watcher": test_hotplug_watcher,
     }
 
     test_runners = tests